@@ -2,6 +2,37 @@ const { createResponse, createErrorResponse } = require('../utils/responseUtils'
 const Joi = require('joi');
 const AIService = require('../services/aiService');
 
+// Texts accepted per /predict/batch call; batches of 32+ are spread across worker threads
+const MAX_BATCH_PREDICTIONS = 100;
+
+// Request schemas, compiled once at load instead of on every request
+const ANALYZE_SCHEMA = Joi.object({
+  content: Joi.string().required(),
+  context: Joi.object(),
+});
+
+const BATCH_PREDICTION_SCHEMA = Joi.object({
+  contents: Joi.array().items(Joi.string().required()).min(1).max(MAX_BATCH_PREDICTIONS).required(),
+  contexts: Joi.array().items(Joi.object()),
+});
+
+const REPHRASE_SCHEMA = Joi.object({
+  message: Joi.string().required(),
+  context: Joi.object(),
+});
+
+const EDUCATION_SCHEMA = Joi.object({
+  messageType: Joi.string().required(),
+  context: Joi.object(),
+});
+
+const CONTEXTUAL_SUGGESTIONS_SCHEMA = Joi.object({
+  message: Joi.string().required(),
+  emotion: Joi.string(),
+  platform: Joi.string(),
+  context: Joi.object(),
+});
+
 class AIController {
   constructor() {
     this.aiService = new AIService();
@@ -19,14 +50,21 @@ class AIController {
   // 🔍 Content Analysis Endpoint
   // ==============================
   analyzeContent = async (req, res) => {
-    const schema = Joi.object({
-      content: Joi.string().required(),
-      context: Joi.object(),
-    });
+    return this._analyze(req, res, (content, context) => this.aiService.analyzeContent(content, context));
+  }
+
+  // ==============================
+  // 🎯 Legacy /predict Endpoint
+  // ==============================
+  // Prediction traffic arrives in bursts, so requests are coalesced into short batches
+  getPrediction = async (req, res) => {
+    return this._analyze(req, res, (content, context) => this.aiService.analyzeCoalesced(content, context));
+  }
 
+  async _analyze(req, res, analyze) {
     try {
       // Validate input first
-      const { error } = schema.validate(req.body);
+      const { error } = ANALYZE_SCHEMA.validate(req.body);
       if (error) {
         return res.status(400).json(createErrorResponse('Validation Error', error.details[0].message));
       }
@@ -34,64 +72,62 @@ class AIController {
       const { content, context = {} } = req.body;
 
       // Use integrated AI service
-      const analysisResult = await this.aiService.analyzeContent(content, context);
-
-      // Transform response to match frontend expectations
-      const transformedResult = {
-        category: analysisResult.categories?.[0] || 'none',
-        severity: analysisResult.risk_level?.toLowerCase() || 'low',
-        toxicity_score: analysisResult.risk_score / 100, // Normalize 0-100 to 0-1
-        explanation: `Risk level: ${analysisResult.risk_level}. ${analysisResult.detections?.length || 0} detections found.`,
-        suggestion: analysisResult.suggestions?.[0] || 'No suggestion available',
-        detailed_analysis: analysisResult,
-        // Add missing fields that tests expect
-        is_abusive: analysisResult.is_abusive,
-        risk_score: analysisResult.risk_score,
-        risk_level: analysisResult.risk_level,
-        categories: analysisResult.categories,
-        detections: analysisResult.detections,
-        suggestions: analysisResult.suggestions
-      };
+      const analysisResult = await analyze(content, context);
 
-      res.json(createResponse('Content analyzed successfully', transformedResult));
+      res.json(createResponse('Content analyzed successfully', this._transformAnalysis(analysisResult)));
     } catch (err) {
       console.error('Analyze content error:', err.message);
-      res.status(500).json(createErrorResponse('AI Analysis Failed', err.message));
+      if (err.status === 503) res.set('Retry-After', '1');
+      res.status(err.status || 500).json(createErrorResponse('AI Analysis Failed', err.message));
     }
   }
 
   // ==============================
-  // 🎯 Legacy /predict Endpoint
+  // 📦 Batch /predict Endpoint
   // ==============================
-  getPrediction = async (req, res) => {
-    return this.analyzeContent(req, res);
+  // Many texts in one request: one round trip, and one batch for the AI service to spread over workers
+  getBatchPrediction = async (req, res) => {
+    try {
+      // Validate input first
+      const { error } = BATCH_PREDICTION_SCHEMA.validate(req.body);
+      if (error) {
+        return res.status(400).json(createErrorResponse('Validation Error', error.details[0].message));
+      }
+
+      const { contents, contexts = [] } = req.body;
+
+      const analysisResults = await this.aiService.batchAnalyzeBounded(contents, contexts);
+
+      res.json(createResponse('Batch analyzed successfully', {
+        results: analysisResults.map(analysisResult => this._transformAnalysis(analysisResult))
+      }));
+    } catch (err) {
+      console.error('Batch analyze error:', err.message);
+      if (err.status === 503) res.set('Retry-After', '1');
+      res.status(err.status || 500).json(createErrorResponse('AI Analysis Failed', err.message));
+    }
   }
 
   // ==============================
   // 💬 Rephrasing Suggestions
   // ==============================
   getRephrasingSuggestions = async (req, res) => {
-    console.log('getRephrasingSuggestions called with:', req.body);
-    const schema = Joi.object({
-      message: Joi.string().required(),
-      context: Joi.object(),
-    });
-
     try {
       // Validate input first
-      const { error } = schema.validate(req.body);
+      const { error } = REPHRASE_SCHEMA.validate(req.body);
       if (error) {
-        console.log('Validation error:', error.details[0].message);
         return res.status(400).json(createErrorResponse('Validation Error', error.details[0].message));
       }
 
       const { message, context = {} } = req.body;
-      console.log('Generating rephrasing suggestions for:', message);
 
       // Use integrated AI service
       const suggestionsResult = await this.aiService.getRephrasingSuggestions(message, context);
 
-      console.log('Rephrasing suggestions generated:', suggestionsResult);
+      if ((req.get('Accept') || '').includes('text/event-stream')) {
+        return this._streamRephrasing(res, suggestionsResult);
+      }
+
       res.json(createResponse('Rephrasing suggestions generated successfully', suggestionsResult));
     } catch (err) {
       console.error('Rephrasing error:', err.message);
@@ -103,14 +139,9 @@ class AIController {
   // 📘 Educational Content
   // ==============================
   getEducationalContent = async (req, res) => {
-    const schema = Joi.object({
-      messageType: Joi.string().required(),
-      context: Joi.object(),
-    });
-
     try {
       // Validate input first
-      const { error } = schema.validate(req.body);
+      const { error } = EDUCATION_SCHEMA.validate(req.body);
       if (error) {
         return res.status(400).json(createErrorResponse('Validation Error', error.details[0].message));
       }
@@ -131,16 +162,9 @@ class AIController {
   // 🤝 Contextual Suggestions
   // ==============================
   getContextualSuggestions = async (req, res) => {
-    const schema = Joi.object({
-      message: Joi.string().required(),
-      emotion: Joi.string(),
-      platform: Joi.string(),
-      context: Joi.object(),
-    });
-
     try {
       // Validate input first
-      const { error } = schema.validate(req.body);
+      const { error } = CONTEXTUAL_SUGGESTIONS_SCHEMA.validate(req.body);
       if (error) {
         return res.status(400).json(createErrorResponse('Validation Error', error.details[0].message));
       }
@@ -173,6 +197,18 @@ class AIController {
     }
   }
 
+  // ==============================
+  // 📈 Latency Metrics (Prometheus)
+  // ==============================
+  getServiceMetrics = async (req, res) => {
+    try {
+      res.type('text/plain; version=0.0.4').send(this.aiService.getMetrics());
+    } catch (err) {
+      console.error('AI metrics error:', err.message);
+      res.status(500).json(createErrorResponse('Metrics Failed', err.message));
+    }
+  }
+
   // ==============================
   // 🩺 AI Service Health Check
   // ==============================
@@ -223,6 +259,45 @@ class AIController {
 
   // Helper methods
 
+  // Send suggestions as Server-Sent Events, best first, so clients can render each one as it arrives
+  _streamRephrasing(res, suggestionsResult) {
+    const { suggestions, ...summary } = suggestionsResult;
+
+    res.set({
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      'Connection': 'keep-alive',
+      'X-Accel-Buffering': 'no'
+    });
+    res.flushHeaders();
+
+    for (const suggestion of suggestions) {
+      res.write(`event: suggestion\ndata: ${JSON.stringify(suggestion)}\n\n`);
+      if (res.flush) res.flush(); // push past the compression buffer
+    }
+    res.write(`event: done\ndata: ${JSON.stringify(summary)}\n\n`);
+    res.end();
+  }
+
+  // Shape an analysis result the way the frontend expects it
+  _transformAnalysis(analysisResult) {
+    return {
+      category: analysisResult.categories?.[0] || 'none',
+      severity: analysisResult.risk_level?.toLowerCase() || 'low',
+      toxicity_score: analysisResult.risk_score / 100, // Normalize 0-100 to 0-1
+      explanation: `Risk level: ${analysisResult.risk_level}. ${analysisResult.detections?.length || 0} detections found.`,
+      suggestion: analysisResult.suggestions?.[0] || 'No suggestion available',
+      detailed_analysis: analysisResult,
+      // Add missing fields that tests expect
+      is_abusive: analysisResult.is_abusive,
+      risk_score: analysisResult.risk_score,
+      risk_level: analysisResult.risk_level,
+      categories: analysisResult.categories,
+      detections: analysisResult.detections,
+      suggestions: analysisResult.suggestions
+    };
+  }
+
   _getEducationalContent(messageType, context) {
     const educationalMessages = {
       'insult': {
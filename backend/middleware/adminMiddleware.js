@@ -3,8 +3,6 @@ const jwtConfig = require('../config/jwt');
 
 // Middleware to check if user has admin privileges
 function requireAdmin(req, res, next) {
-  console.log('--- ADMIN MIDDLEWARE INITIATED ---');
-
   // Check if user is authenticated and has admin role
   if (!req.user) {
     console.error('Admin Middleware Error: No user found in request. Authentication middleware must be applied first.');
@@ -23,7 +21,6 @@ function requireAdmin(req, res, next) {
     });
   }
 
-  console.log('Admin Middleware Success: Admin access granted for user:', req.user.userId || req.user.id);
   return next();
 }
 
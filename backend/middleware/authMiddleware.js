@@ -4,8 +4,6 @@ const User = require('../models/User');
 
 // This middleware verifies JWTs using the jwtConfig helper
 async function protect(req, res, next) {
-  console.log('--- CUSTOM PROTECT MIDDLEWARE INITIATED ---');
-
   const authHeader = req.headers.authorization;
   if (!authHeader || !authHeader.startsWith('Bearer ')) {
     console.error('Middleware Error: No "Bearer" token found in Authorization header.');
@@ -16,7 +14,6 @@ async function protect(req, res, next) {
   }
 
   const token = authHeader.split(' ')[1];
-  console.log('Middleware Info: Extracted Token:', token?.substring(0, 40) + '...');
 
   // Use jwtConfig to verify the access token (ensures consistent secret/options)
   try {
@@ -55,7 +52,6 @@ async function protect(req, res, next) {
       }
     }
 
-    console.log('Middleware Success: Token verified for user:', req.userId);
     return next();
   } catch (err) {
     console.error('--- CUSTOM PROTECT MIDDLEWARE FAILED ---', err);
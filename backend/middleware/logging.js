@@ -5,6 +5,7 @@ const path = require('path');
 class LoggingService {
   constructor() {
     this.logDirectory = process.env.LOG_DIRECTORY || './logs';
+    this.logStreams = new Map();
   }
 
   // Ensure log directory exists
@@ -15,24 +16,32 @@ class LoggingService {
     }
   }
 
-  // Setup log streams
-  setupLogStreams() {
-    const logDate = new Date().toISOString().split('T')[0];
-    
-    this.accessLogStream = fs.createWriteStream(
-      path.join(this.logDirectory, `access-${logDate}.log`),
-      { flags: 'a' }
-    );
+  // Streams are opened on first write, so logs that are never written (audit, for now,
+  // and every log in the cluster primary) hold no file descriptor
+  logStream(kind) {
+    let stream = this.logStreams.get(kind);
+    if (!stream) {
+      this.ensureLogDirectory();
+      const logDate = new Date().toISOString().split('T')[0];
+      stream = fs.createWriteStream(
+        path.join(this.logDirectory, `${kind}-${logDate}.log`),
+        { flags: 'a' }
+      );
+      this.logStreams.set(kind, stream);
+    }
+    return stream;
+  }
 
-    this.errorLogStream = fs.createWriteStream(
-      path.join(this.logDirectory, `error-${logDate}.log`),
-      { flags: 'a' }
-    );
+  get accessLogStream() {
+    return this.logStream('access');
+  }
+
+  get errorLogStream() {
+    return this.logStream('error');
+  }
 
-    this.auditLogStream = fs.createWriteStream(
-      path.join(this.logDirectory, `audit-${logDate}.log`),
-      { flags: 'a' }
-    );
+  get auditLogStream() {
+    return this.logStream('audit');
   }
 
   // Custom Morgan token for user information
@@ -69,7 +78,7 @@ class LoggingService {
     this.setupMorganTokens();
     const format = ':real-ip - :user-id [:date[clf]] ":method :url HTTP/:http-version" :status :res[content-length] ":referrer" ":user-agent" :response-time-ms ms :request-id';
     return morgan(format, {
-      stream: this.accessLogStream,
+      stream: { write: (line) => this.accessLogStream.write(line) },
       skip: (req) => req.url.includes('/health')
     });
   }
@@ -158,35 +167,36 @@ class LoggingService {
     };
   }
 
-  // Direct error logging method
-  logError(message, details = {}) {
-    const errorLog = {
+  // Serialize a structured log entry once, as a single JSON line
+  formatLogLine(level, message, details) {
+    return JSON.stringify({
       timestamp: new Date().toISOString(),
-      level: 'ERROR',
+      level,
       message,
       details
-    };
+    });
+  }
+
+  // Direct error logging method
+  logError(message, details = {}) {
+    const line = this.formatLogLine('ERROR', message, details);
 
     try {
-      this.errorLogStream.write(JSON.stringify(errorLog) + '\n');
+      this.errorLogStream.write(line + '\n');
     } catch (logError) {
       console.error('Failed to write to error log:', logError.message);
     }
 
-    console.error('🚨 Error:', message, details);
+    // Reuse the JSON line rather than having the console deep-inspect details again
+    console.error('🚨 Error:', line);
   }
 
   // Direct info logging method
   logInfo(message, details = {}) {
-    const infoLog = {
-      timestamp: new Date().toISOString(),
-      level: 'INFO',
-      message,
-      details
-    };
+    const line = this.formatLogLine('INFO', message, details);
 
     try {
-      this.accessLogStream.write(JSON.stringify(infoLog) + '\n');
+      this.accessLogStream.write(line + '\n');
     } catch (logError) {
       console.error('Failed to write to info log:', logError.message);
     }
@@ -198,7 +208,6 @@ class LoggingService {
   initialize() {
     console.log('📝 Initializing logging system...');
     this.ensureLogDirectory();
-    this.setupLogStreams();
     console.log('✅ Logging system initialized successfully');
     console.log(`📁 Log directory: ${this.logDirectory}`);
   }
@@ -206,9 +215,10 @@ class LoggingService {
   // Graceful shutdown
   shutdown() {
     console.log('📝 Shutting down logging system...');
-    this.accessLogStream?.end();
-    this.errorLogStream?.end();
-    this.auditLogStream?.end();
+    for (const stream of this.logStreams.values()) {
+      stream.end();
+    }
+    this.logStreams.clear();
     console.log('✅ Logging system shutdown complete');
   }
 }
@@ -3,6 +3,20 @@ const rateLimit = require('express-rate-limit');
 const { RATE_LIMITS, HTTP_STATUS } = require('../config/constants');
 const { createResponse } = require('../utils/responseUtils');
 
+// Progressive limiter bookkeeping: how long a violation counts, and how many
+// clients are tracked before the least recently violating one is dropped
+const VIOLATION_TTL_MS = 24 * 60 * 60 * 1000;
+const MAX_TRACKED_VIOLATORS = 10000;
+
+// Paths that never count against rate limits
+const HEALTH_CHECK_PATHS = new Set([
+  '/health',
+  '/api/health',
+  '/status',
+  '/ping',
+  '/api/status'
+]);
+
 class RateLimitingService {
   
   // Create rate limiter with custom options
@@ -196,9 +210,31 @@ class RateLimitingService {
 
   // Dynamic rate limiter based on user role
   dynamicRoleLimiter() {
+    const windowMs = 15 * 60 * 1000; // 15 minutes
+
+    // One limiter (and counter store) per role, built once so request counts
+    // persist across requests instead of starting fresh every time
+    const limiters = new Map();
+    const limiterFor = (maxRequests) => {
+      let limiter = limiters.get(maxRequests);
+      if (!limiter) {
+        limiter = this.createRateLimiter({
+          windowMs,
+          max: maxRequests,
+          message: createResponse(
+            false,
+            `Rate limit exceeded for your user role. Limit: ${maxRequests} requests per ${windowMs / 60000} minutes`,
+            null,
+            'ROLE_BASED_RATE_LIMIT_EXCEEDED'
+          )
+        });
+        limiters.set(maxRequests, limiter);
+      }
+      return limiter;
+    };
+
     return (req, res, next) => {
       let maxRequests = 100; // default
-      let windowMs = 15 * 60 * 1000; // 15 minutes
 
       if (req.user) {
         switch (req.user.role) {
@@ -218,18 +254,7 @@ class RateLimitingService {
         maxRequests = 50; // Lower limit for unauthenticated users
       }
 
-      const limiter = this.createRateLimiter({
-        windowMs,
-        max: maxRequests,
-        message: createResponse(
-          false,
-          `Rate limit exceeded for your user role. Limit: ${maxRequests} requests per ${windowMs / 60000} minutes`,
-          null,
-          'ROLE_BASED_RATE_LIMIT_EXCEEDED'
-        )
-      });
-
-      return limiter(req, res, next);
+      return limiterFor(maxRequests)(req, res, next);
     };
   }
 
@@ -287,17 +312,19 @@ class RateLimitingService {
 
   // Whitelist middleware (bypass rate limiting for specific IPs/users)
   createWhitelistMiddleware(whitelist = []) {
+    const allowed = new Set(whitelist);
+
     return (req, res, next) => {
       const ip = req.ip || req.connection.remoteAddress;
       const userId = req.user?.id;
 
       // Check IP whitelist
-      if (whitelist.includes(ip)) {
+      if (allowed.has(ip)) {
         req.skipRateLimit = true;
       }
 
       // Check user whitelist (for admin users, etc.)
-      if (req.user && (req.user.role === 'admin' || whitelist.includes(userId))) {
+      if (req.user && (req.user.role === 'admin' || allowed.has(userId))) {
         req.skipRateLimit = true;
       }
 
@@ -308,15 +335,7 @@ class RateLimitingService {
   // Rate limit bypass for health checks and monitoring
   healthCheckBypass() {
     return (req, res, next) => {
-      const healthCheckPaths = [
-        '/health',
-        '/api/health',
-        '/status',
-        '/ping',
-        '/api/status'
-      ];
-
-      if (healthCheckPaths.includes(req.path)) {
+      if (HEALTH_CHECK_PATHS.has(req.path)) {
         req.skipRateLimit = true;
       }
 
@@ -341,11 +360,55 @@ class RateLimitingService {
 
   // Progressive rate limiting (increases restriction based on violations)
   createProgressiveRateLimiter(baseOptions = {}) {
-    const violations = new Map(); // In production, use Redis
+    // key -> { count, expiresAt }, oldest first; in production, use Redis
+    const violations = new Map();
+    // One limiter per backoff multiplier, so counts persist across requests
+    const limiters = new Map();
+
+    const getViolationCount = (key) => {
+      const entry = violations.get(key);
+      if (!entry) return 0;
+
+      // Expired entries are dropped lazily instead of by a timer per violation
+      if (entry.expiresAt <= Date.now()) {
+        violations.delete(key);
+        return 0;
+      }
+      return entry.count;
+    };
+
+    const recordViolation = (key) => {
+      const count = getViolationCount(key) + 1;
+
+      // Re-insert so the map stays ordered by most recent violation
+      violations.delete(key);
+      violations.set(key, { count, expiresAt: Date.now() + VIOLATION_TTL_MS });
+
+      if (violations.size > MAX_TRACKED_VIOLATORS) {
+        violations.delete(violations.keys().next().value);
+      }
+    };
+
+    const limiterFor = (multiplier) => {
+      let limiter = limiters.get(multiplier);
+      if (!limiter) {
+        limiter = this.createRateLimiter({
+          ...baseOptions,
+          max: Math.max(1, Math.floor((baseOptions.max || 100) / multiplier)),
+          windowMs: (baseOptions.windowMs || 15 * 60 * 1000) * multiplier,
+          onLimitReached: (req) => {
+            // Increase violation count
+            recordViolation(req.ip || req.connection.remoteAddress);
+          }
+        });
+        limiters.set(multiplier, limiter);
+      }
+      return limiter;
+    };
 
     return (req, res, next) => {
       const key = req.ip || req.connection.remoteAddress;
-      const violationCount = violations.get(key) || 0;
+      const violationCount = getViolationCount(key);
 
       // Increase restrictions based on violation history
       let multiplier = 1;
@@ -353,26 +416,7 @@ class RateLimitingService {
         multiplier = Math.min(10, Math.pow(2, violationCount)); // Exponential backoff
       }
 
-      const dynamicOptions = {
-        ...baseOptions,
-        max: Math.max(1, Math.floor((baseOptions.max || 100) / multiplier)),
-        windowMs: (baseOptions.windowMs || 15 * 60 * 1000) * multiplier
-      };
-
-      const limiter = this.createRateLimiter({
-        ...dynamicOptions,
-        onLimitReached: (req, res) => {
-          // Increase violation count
-          violations.set(key, violationCount + 1);
-          
-          // Set expiry for violations (clean up after 24 hours)
-          setTimeout(() => {
-            violations.delete(key);
-          }, 24 * 60 * 60 * 1000);
-        }
-      });
-
-      return limiter(req, res, next);
+      return limiterFor(multiplier)(req, res, next);
     };
   }
 }
@@ -16,6 +16,9 @@ router.post('/analyze', aiController.analyzeContent);
 // POST /api/ai/predict - Legacy predict endpoint (redirects to analyze)
 router.post('/predict', aiController.getPrediction);
 
+// POST /api/ai/predict/batch - Analyze up to 100 texts in one request
+router.post('/predict/batch', aiController.getBatchPrediction);
+
 // POST /api/ai/rephrase - Get rephrasing suggestions
 router.post('/rephrase', aiController.getRephrasingSuggestions);
 
@@ -28,4 +31,7 @@ router.post('/suggestions', aiController.getContextualSuggestions);
 // GET /api/ai/health - AI service health check
 router.get('/health', aiController.getServiceHealth);
 
+// GET /api/ai/metrics - Per-stage latency histograms in Prometheus format
+router.get('/metrics', aiController.getServiceMetrics);
+
 module.exports = router;
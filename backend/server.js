@@ -1,4 +1,5 @@
 // --- Imports ---
+const cluster = require('cluster');
 const express = require('express');
 const mongoose = require('mongoose');
 const cors = require('cors');
@@ -26,6 +27,9 @@ const protect = require('./middleware/authMiddleware');
 
 const app = express();
 
+// Every response here is dynamic JSON; skip hashing each serialized body into an ETag
+app.set('etag', false);
+
 // ------------------
 // 🛡️ Security & Middlewares
 // ------------------
@@ -45,7 +49,7 @@ app.use(helmet({
 app.use(compression());
 
 // ✅ Updated CORS Configuration
-const allowedOrigins = [
+const allowedOrigins = new Set([
   process.env.APP_URL || 'http://localhost:3000',
   'http://localhost:3000',
   'http://localhost:3001',
@@ -56,14 +60,14 @@ const allowedOrigins = [
   'https://www.typeaware.com',
   'https://app.typeaware.com',
   'https://type-aware-cycber-bully-ai-git-main-dhruvs-projects-1256a535.vercel.app'
-];
+]);
 
 const corsOptions = {
   origin: function (origin, callback) {
     if (!origin) return callback(null, true);
 
     if (
-      allowedOrigins.includes(origin) ||
+      allowedOrigins.has(origin) ||
       origin.startsWith('chrome-extension://') ||
       origin.startsWith('moz-extension://')
     ) {
@@ -223,16 +227,46 @@ app.use((error, req, res, next) => {
 // 🚀 Server Startup
 // ------------------
 const PORT = process.env.PORT || 5000;
+// HTTP worker processes sharing the port; each one has its own event loop and AI engines
+const WEB_CONCURRENCY = parseInt(process.env.WEB_CONCURRENCY, 10) || 1;
 
 module.exports = app;
 
-if (process.env.NODE_ENV !== 'test') {
-  initializeDatabase().then(() => {
+if (process.env.NODE_ENV !== 'test' && WEB_CONCURRENCY > 1 && cluster.isPrimary) {
+  console.log(`🧵 Starting ${WEB_CONCURRENCY} worker processes`);
+  for (let i = 0; i < WEB_CONCURRENCY; i++) {
+    cluster.fork();
+  }
+
+  const listening = new Set();
+  cluster.on('listening', (worker) => listening.add(worker.id));
+
+  cluster.on('exit', (worker, code, signal) => {
+    // A worker that never started (database down, port taken) would fail again the same way
+    if (!listening.delete(worker.id)) {
+      console.error(`❌ Worker ${worker.process.pid} failed to start, shutting down`);
+      process.exit(code || 1);
+    }
+
+    console.error(`❌ Worker ${worker.process.pid} exited (${signal || code}), starting a replacement`);
+    cluster.fork();
+  });
+} else if (process.env.NODE_ENV !== 'test') {
+  initializeDatabase().then(async () => {
+    // Warm the AI engines before accepting traffic so the first requests don't pay for it
+    await aiController.aiService.warmUp();
+    console.log('🔥 AI engines warmed up');
+
     const server = app.listen(PORT, () => {
       console.log(`🚀 Backend running on http://localhost:${PORT}`);
       loggingService.logInfo?.(`Server started on port ${PORT}`);
     });
 
+    // Keep client connections open longer than the proxy's idle timeout so
+    // small JSON requests reuse sockets instead of paying a reconnect each time
+    server.keepAliveTimeout = parseInt(process.env.KEEP_ALIVE_TIMEOUT_MS, 10) || 65000;
+    server.headersTimeout = server.keepAliveTimeout + 1000;
+
     server.on('error', (err) => {
       if (err.code === 'EADDRINUSE') {
         console.error(`❌ Port ${PORT} is already in use.`);
@@ -0,0 +1,49 @@
+/**
+ * aiBatchWorker - Worker thread entry point for AIService.batchAnalyze and batchAnalyzeColumns
+ * Analyzes blocks of a large batch as the parent hands them out and posts the results
+ * (or result columns) back, with the engine stage timings gathered meanwhile;
+ * a null message tells the worker to exit
+ */
+
+const { parentPort } = require('worker_threads');
+const AIService = require('./aiService');
+
+const aiService = new AIService();
+
+// The parent posts blocks ahead of time; handle them strictly one after another
+let queue = Promise.resolve();
+
+parentPort.on('message', (block) => {
+  queue = queue.then(() => handleBlock(block));
+});
+
+async function handleBlock(block) {
+  if (!block) {
+    parentPort.close();
+    return;
+  }
+
+  const { texts, contexts = [], columns = false } = block;
+
+  if (columns) {
+    // Column mode: fill typed arrays and transfer their buffers instead of cloning objects
+    const resultColumns = AIService.createResultColumns(texts.length);
+    for (let i = 0; i < texts.length; i++) {
+      AIService.writeResultColumns(resultColumns, i, await aiService.analyzeContent(texts[i], contexts[i] || {}));
+    }
+
+    const transfer = Object.values(resultColumns)
+      .filter(values => ArrayBuffer.isView(values))
+      .map(values => values.buffer);
+    parentPort.postMessage({ payload: resultColumns, stageTimings: aiService.drainStageTimings() }, transfer);
+    return;
+  }
+
+  const results = [];
+
+  for (let i = 0; i < texts.length; i++) {
+    results.push(await aiService.analyzeContent(texts[i], contexts[i] || {}));
+  }
+
+  parentPort.postMessage({ payload: results, stageTimings: aiService.drainStageTimings() });
+}
@@ -8,6 +8,80 @@ const { ObfuscationDetector } = require('./obfuscationDetector');
 const { FuzzyMatcher } = require('./fuzzyMatcher_enhanced');
 const { PatternAnalyzer } = require('./patternAnalyzer_enhanced');
 const { RephrasingEngine } = require('./rephrasingEngine');
+const os = require('os');
+const { performance } = require('perf_hooks');
+const path = require('path');
+const { Worker } = require('worker_threads');
+
+// Batches smaller than this are analyzed inline; spinning up workers costs more than it saves
+const PARALLEL_BATCH_THRESHOLD = 32;
+// Texts handed to a worker per queue pull
+const BATCH_BLOCK_SIZE = 8;
+// Blocks posted ahead to each worker, so it never sits idle waiting for the next one
+const BLOCKS_IN_FLIGHT = 2;
+// Batch workers shared by every AIService in this thread, leaving a core for the event loop;
+// the cores are split between the HTTP worker processes when the server runs several
+const BATCH_POOL_SIZE = Math.max(1, Math.floor(os.cpus().length / (parseInt(process.env.WEB_CONCURRENCY, 10) || 1)) - 1);
+const batchWorkerPool = { idle: [], live: 0, waiters: [] };
+// Single analyses arriving within this window are run together as one batch
+const COALESCE_WINDOW_MS = 5;
+const COALESCE_MAX_BATCH = 64;
+// Coalesced requests (queued or being analyzed) beyond which new ones are shed
+const COALESCE_MAX_BACKLOG = 1024;
+// Client batches (see batchAnalyzeBounded) analyzed at once; later ones queue, and are
+// shed once BATCH_MAX_WAITING are already queued
+const BATCH_CONCURRENCY = Math.min(64, 2 * os.cpus().length);
+const BATCH_MAX_WAITING = 64;
+// Full analysis results remembered for repeated messages
+const ANALYSIS_CACHE_SIZE = 4096;
+// Run through every engine at start-up (see warmUp): clean, abusive and obfuscated text
+const WARM_UP_TEXTS = Object.freeze([
+  'Thanks for the help yesterday, see you at the meeting tomorrow!',
+  'You are such a stupid idiot, nobody here likes you',
+  'sh1t this is f u c k i n g annoying, SHUT UP you l0ser!!!'
+]);
+
+// Engine passes of a full analysis, timed separately (see getMetrics)
+const ANALYSIS_STAGES = Object.freeze(['content', 'obfuscation', 'pattern', 'fuzzy', 'rephrasing']);
+// Upper bounds, in milliseconds, of the latency histogram buckets; one more bucket catches the rest
+const LATENCY_BUCKETS_MS = Object.freeze([0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250]);
+
+function createTiming() {
+  return { count: 0, sum: 0, buckets: new Float64Array(LATENCY_BUCKETS_MS.length + 1) };
+}
+
+function createStageTimings() {
+  const timings = {};
+  for (const stage of ANALYSIS_STAGES) timings[stage] = createTiming();
+  return timings;
+}
+
+function observeTiming(timing, ms) {
+  let bucket = 0;
+  while (bucket < LATENCY_BUCKETS_MS.length && ms > LATENCY_BUCKETS_MS[bucket]) bucket++;
+  timing.count++;
+  timing.sum += ms;
+  timing.buckets[bucket]++;
+}
+
+// Upper bound of the bucket holding the given quantile; null when it is past the last bound
+function timingQuantile(timing, quantile) {
+  if (timing.count === 0) return 0;
+
+  const rank = quantile * timing.count;
+  let seen = 0;
+  for (let bucket = 0; bucket < LATENCY_BUCKETS_MS.length; bucket++) {
+    seen += timing.buckets[bucket];
+    if (seen >= rank) return LATENCY_BUCKETS_MS[bucket];
+  }
+  return null;
+}
+
+// Always handed to the obfuscation and fuzzy passes alongside words the content engine found
+const COMMON_ABUSIVE_WORDS = Object.freeze([
+  'stupid', 'dumb', 'idiot', 'moron', 'loser', 'pathetic', 'worthless',
+  'fuck', 'shit', 'bitch', 'asshole', 'bastard', 'cunt', 'dick', 'pussy'
+]);
 
 class AIService {
   constructor() {
@@ -17,13 +91,31 @@ class AIService {
     this.patternAnalyzer = new PatternAnalyzer();
     this.rephrasingEngine = new RephrasingEngine();
 
+    // Full analysis results keyed by context and text (LRU, see _cacheAnalysis)
+    this.analysisCache = new Map();
+
     this.stats = {
       total_requests: 0,
-      processing_times: [],
+      // Running totals, so the average needs no per-request history
+      timed_requests: 0,
+      total_processing_time: 0,
       error_count: 0,
       cache_hits: 0,
-      cache_misses: 0
+      cache_misses: 0,
+      shed_count: 0
     };
+    // Latency histograms: every request, and each engine pass of full analyses
+    this.requestTiming = createTiming();
+    this.stageTimings = createStageTimings();
+
+    // Requests waiting for the next coalesced batch (see analyzeCoalesced)
+    this.pendingAnalyses = [];
+    this.pendingFlushTimer = null;
+    this.coalescedInFlight = 0;
+
+    // Client batches being analyzed, and resolvers of those waiting for a slot
+    this.activeBatches = 0;
+    this.batchWaiters = [];
 
     console.log('AIService initialized with all detection engines');
   }
@@ -35,31 +127,59 @@ class AIService {
    * @returns {Object} Analysis results
    */
   async analyzeContent(text, context = {}) {
-    const startTime = Date.now();
+    const startTime = performance.now();
     this.stats.total_requests++;
 
     try {
       if (!text || typeof text !== 'string') {
-        return this._createEmptyAnalysis();
+        const emptyResult = this._createEmptyAnalysis(performance.now() - startTime);
+        this._recordProcessingTime(emptyResult.processing_time);
+        return emptyResult;
       }
 
+      // Repeated messages (spam floods, copy-pasted insults) skip every engine
+      const contextKey = this._contextCacheKey(context);
+      const cacheKey = contextKey !== null ? `${contextKey}\u0000${text}` : null;
+      const cachedResult = cacheKey && this.analysisCache.get(cacheKey);
+      if (cachedResult) {
+        this.stats.cache_hits++;
+        // Re-insert so the Map's insertion order tracks recency (LRU)
+        this.analysisCache.delete(cacheKey);
+        this.analysisCache.set(cacheKey, cachedResult);
+
+        const result = { ...cachedResult, processing_time: performance.now() - startTime };
+        this._recordProcessingTime(result.processing_time);
+        return result;
+      }
+
+      this.stats.cache_misses++;
+
+      // Lowercased once and shared by the obfuscation, pattern and fuzzy passes
+      const lowerText = text.toLowerCase();
+
       // Step 1: Basic content detection
+      let stageStart = performance.now();
       const contentResult = this.contentEngine.detectAbusiveContent(text, context);
+      stageStart = this._recordStage('content', stageStart);
 
       // Step 2: Obfuscation detection
       const abusiveWords = this._extractAbusiveWords(contentResult);
       const obfuscationMatches = this.obfuscationDetector.detectObfuscatedWords(text, abusiveWords);
+      stageStart = this._recordStage('obfuscation', stageStart);
 
       // Step 3: Pattern analysis
-      const patternAnalysis = this.patternAnalyzer.analyzeMessagePatterns(text, context);
+      const patternAnalysis = this.patternAnalyzer.analyzeMessagePatterns(text, context, lowerText);
+      stageStart = this._recordStage('pattern', stageStart);
 
       // Step 4: Fuzzy matching for additional detection
-      const fuzzyMatches = this.fuzzyMatcher.findContextAwareMatches(text, abusiveWords, context);
+      const fuzzyMatches = this.fuzzyMatcher.findContextAwareMatches(text, abusiveWords, context, lowerText);
+      stageStart = this._recordStage('fuzzy', stageStart);
 
       // Step 5: Generate rephrasing suggestions if content is problematic
       let rephrasingSuggestions = null;
       if (contentResult.is_abusive || patternAnalysis.overall_risk > 30) {
         rephrasingSuggestions = this.rephrasingEngine.generateSuggestions(text, context);
+        this._recordStage('rephrasing', stageStart);
       }
 
       // Combine results
@@ -72,15 +192,144 @@ class AIService {
         startTime
       );
 
-      this.stats.processing_times.push(Date.now() - startTime);
+      this._recordProcessingTime(combinedResult.processing_time);
+      if (cacheKey) this._cacheAnalysis(cacheKey, combinedResult);
 
       return combinedResult;
 
     } catch (error) {
       console.error('Error in AI content analysis:', error);
       this.stats.error_count++;
-      return this._createErrorAnalysis(text, error.message);
+      const errorResult = this._createErrorAnalysis(text, error.message, performance.now() - startTime);
+      this._recordProcessingTime(errorResult.processing_time);
+      return errorResult;
+    }
+  }
+
+  /**
+   * Comprehensive content analysis, coalesced with other requests arriving in the same
+   * few milliseconds so bursts run as one batch (and on worker threads once large enough).
+   * When the backlog is full the request is shed at once rather than queued behind it.
+   * @param {string} text - Text to analyze
+   * @param {Object} context - Context information
+   * @returns {Promise<Object>} Analysis results, same shape as analyzeContent; rejects
+   *   with an error whose status is 503 when shed
+   */
+  analyzeCoalesced(text, context = {}) {
+    if (this.pendingAnalyses.length + this.coalescedInFlight >= COALESCE_MAX_BACKLOG) {
+      this.stats.shed_count++;
+      const error = new Error('Analysis backlog is full, please retry shortly');
+      error.status = 503;
+      return Promise.reject(error);
+    }
+
+    return new Promise((resolve, reject) => {
+      this.pendingAnalyses.push({ text, context, resolve, reject });
+
+      if (this.pendingAnalyses.length >= COALESCE_MAX_BATCH) {
+        this._flushPendingAnalyses();
+      } else if (!this.pendingFlushTimer) {
+        this.pendingFlushTimer = setTimeout(() => this._flushPendingAnalyses(), COALESCE_WINDOW_MS);
+      }
+    });
+  }
+
+  async _flushPendingAnalyses() {
+    clearTimeout(this.pendingFlushTimer);
+    this.pendingFlushTimer = null;
+
+    const pending = this.pendingAnalyses;
+    this.pendingAnalyses = [];
+    this.coalescedInFlight += pending.length;
+
+    try {
+      // Only distinct messages the cache cannot answer go into the batch; repeats
+      // within the burst are scattered the result of their first occurrence
+      const texts = [];
+      const contexts = [];
+      const cacheKeys = [];
+      const batchIndex = new Map();
+      const slots = new Array(pending.length);
+      // Cache hits, answered now while their entries are certain to be present
+      const cachedAnswers = new Array(pending.length);
+
+      for (let i = 0; i < pending.length; i++) {
+        const { text, context } = pending[i];
+        const contextKey = text && typeof text === 'string' ? this._contextCacheKey(context) : null;
+        const cacheKey = contextKey !== null ? `${contextKey}\u0000${text}` : null;
+
+        if (cacheKey !== null && this.analysisCache.has(cacheKey)) {
+          slots[i] = -1;
+          cachedAnswers[i] = this.analyzeContent(text, context);
+        } else if (cacheKey !== null && batchIndex.has(cacheKey)) {
+          slots[i] = batchIndex.get(cacheKey);
+        } else {
+          if (cacheKey !== null) batchIndex.set(cacheKey, texts.length);
+          slots[i] = texts.length;
+          texts.push(text);
+          contexts.push(context);
+          cacheKeys.push(cacheKey);
+        }
+      }
+
+      const results = texts.length > 0 ? await this._analyzeOffEventLoop(texts, contexts) : [];
+
+      // Worker results never passed through this instance's cache, so remember them here
+      for (let j = 0; j < results.length; j++) {
+        if (cacheKeys[j] !== null && !results[j].error && !this.analysisCache.has(cacheKeys[j])) {
+          this._cacheAnalysis(cacheKeys[j], results[j]);
+        }
+      }
+
+      const answered = new Array(texts.length);
+      for (let i = 0; i < pending.length; i++) {
+        const slot = slots[i];
+
+        if (slot < 0) {
+          pending[i].resolve(cachedAnswers[i]);
+        } else {
+          if (answered[slot]) {
+            // Repeated message: answered by its first occurrence, like a cache hit
+            this.stats.total_requests++;
+            this.stats.cache_hits++;
+            this._recordProcessingTime(0);
+          }
+          answered[slot] = true;
+          pending[i].resolve(results[slot]);
+        }
+      }
+    } catch (error) {
+      console.error('Error in coalesced batch analysis:', error);
+      pending.forEach(request => request.reject(error));
+    } finally {
+      this.coalescedInFlight -= pending.length;
+    }
+  }
+
+  /**
+   * Analyze a coalesced batch on a warm pool worker, keeping the event loop free to serve
+   * other requests even for batches too small for batchAnalyze to parallelize.
+   * Until a worker is warm the batch runs through batchAnalyze and one is warmed for next time,
+   * so no request waits on engine start-up.
+   * @param {string[]} texts - Array of texts to analyze
+   * @param {Object[]} contexts - Array of context objects
+   * @returns {Object[]} Array of analysis results, in input order
+   */
+  async _analyzeOffEventLoop(texts, contexts) {
+    if (texts.length < PARALLEL_BATCH_THRESHOLD) {
+      if (batchWorkerPool.idle.length > 0) {
+        try {
+          // Idle workers only: a cold one would hold the batch until its engines are built
+          return await this._parallelBatchAnalyze(texts, contexts, batchWorkerPool.idle.length);
+        } catch (error) {
+          console.error('Offloaded analysis failed, falling back to inline:', error);
+        }
+      } else if (batchWorkerPool.live < BATCH_POOL_SIZE) {
+        this._warmBatchWorker();
+      }
     }
+
+    return this.batchAnalyze(texts, contexts);
   }
 
   /**
@@ -90,7 +339,7 @@ class AIService {
    * @returns {Object} Simplified analysis for real-time use
    */
   async analyzeRealtime(text, context = {}) {
-    const startTime = Date.now();
+    const startTime = performance.now();
 
     try {
       // Quick content detection only for real-time performance
@@ -107,7 +356,8 @@ class AIService {
         risk_score: riskScore,
         risk_level: this._calculateRiskLevel(riskScore),
         categories: [...new Set([...contentResult.categories, ...patternAnalysis.patterns.map(p => p.pattern_type)])],
-        processing_time: Date.now() - startTime,
+        confidence: Math.max(contentResult.confidence || 0, patternAnalysis.confidence || 0),
+        processing_time: performance.now() - startTime,
         suggestions: isAbusive ? this._getQuickSuggestions(contentResult, patternAnalysis) : []
       };
 
@@ -118,7 +368,7 @@ class AIService {
         risk_score: 0,
         risk_level: 'UNKNOWN',
         categories: [],
-        processing_time: Date.now() - startTime,
+        processing_time: performance.now() - startTime,
         error: error.message
       };
     }
@@ -135,6 +385,14 @@ class AIService {
       throw new Error('Texts must be an array');
     }
 
+    if (texts.length >= PARALLEL_BATCH_THRESHOLD) {
+      try {
+        return await this._parallelBatchAnalyze(texts, contexts);
+      } catch (error) {
+        console.error('Parallel batch analysis failed, falling back to sequential:', error);
+      }
+    }
+
     const results = [];
     const batchSize = 10; // Process in batches to avoid memory issues
 
@@ -148,11 +406,347 @@ class AIService {
 
       const batchResults = await Promise.all(batchPromises);
       results.push(...batchResults);
+
+      await this._yieldToEventLoop();
+    }
+
+    return results;
+  }
+
+  /**
+   * batchAnalyze for client requests, behind a capacity limit: at most BATCH_CONCURRENCY
+   * batches run at once, the next BATCH_MAX_WAITING wait in arrival order, and any beyond
+   * that are shed at once. Without the limit every concurrent batch interleaves on the
+   * event loop and worker pool, and all of them finish late together.
+   * @param {string[]} texts - Array of texts to analyze
+   * @param {Object[]} contexts - Array of context objects
+   * @returns {Promise<Object[]>} Array of analysis results; rejects with an error whose
+   *   status is 503 when shed
+   */
+  async batchAnalyzeBounded(texts, contexts = []) {
+    if (this.activeBatches < BATCH_CONCURRENCY) {
+      this.activeBatches++;
+    } else if (this.batchWaiters.length < BATCH_MAX_WAITING) {
+      // The finishing batch hands its slot straight over, so activeBatches is unchanged
+      await new Promise(resolve => this.batchWaiters.push(resolve));
+    } else {
+      this.stats.shed_count++;
+      const error = new Error('Too many batches in progress, please retry shortly');
+      error.status = 503;
+      throw error;
+    }
+
+    try {
+      return await this.batchAnalyze(texts, contexts);
+    } finally {
+      const next = this.batchWaiters.shift();
+      if (next) {
+        next();
+      } else {
+        this.activeBatches--;
+      }
+    }
+  }
+
+  /**
+   * Batch analysis returning parallel columns instead of one result object per text
+   * @param {string[]} texts - Array of texts to analyze
+   * @param {Object[]} contexts - Array of context objects
+   * @returns {Object} Columns indexed like texts (typed arrays for numeric fields)
+   */
+  async batchAnalyzeColumns(texts, contexts = []) {
+    if (!Array.isArray(texts)) {
+      throw new Error('Texts must be an array');
+    }
+
+    if (texts.length >= PARALLEL_BATCH_THRESHOLD) {
+      try {
+        return await this._parallelBatchAnalyzeColumns(texts, contexts);
+      } catch (error) {
+        console.error('Parallel column batch analysis failed, falling back to sequential:', error);
+      }
+    }
+
+    const columns = AIService.createResultColumns(texts.length);
+    for (let i = 0; i < texts.length; i++) {
+      AIService.writeResultColumns(columns, i, await this.analyzeContent(texts[i], contexts[i] || {}));
+      if ((i + 1) % BATCH_BLOCK_SIZE === 0) await this._yieldToEventLoop();
+    }
+
+    return columns;
+  }
+
+  /**
+   * Let pending I/O callbacks (other HTTP requests) run between blocks of inline analysis.
+   * analyzeContent is synchronous CPU work behind an async signature, so awaiting it never yields.
+   * @returns {Promise<void>}
+   */
+  _yieldToEventLoop() {
+    return new Promise(resolve => setImmediate(resolve));
+  }
+
+  /**
+   * Allocate empty result columns for a batch of n texts
+   * @param {number} n - Batch size
+   * @returns {Object} Preallocated columns
+   */
+  static createResultColumns(n) {
+    return {
+      is_abusive: new Uint8Array(n),
+      risk_score: new Float64Array(n),
+      confidence: new Float64Array(n),
+      processing_time: new Float64Array(n),
+      failed: new Uint8Array(n),
+      risk_level: new Array(n),
+      categories: new Array(n)
+    };
+  }
+
+  /**
+   * Copy the column fields of one analysis result into row i
+   * @param {Object} columns - Columns from createResultColumns
+   * @param {number} i - Row index
+   * @param {Object} result - Result from analyzeContent
+   */
+  static writeResultColumns(columns, i, result) {
+    columns.is_abusive[i] = result.is_abusive ? 1 : 0;
+    columns.risk_score[i] = result.risk_score || 0;
+    columns.confidence[i] = result.confidence || 0;
+    columns.processing_time[i] = result.processing_time || 0;
+    columns.failed[i] = result.error ? 1 : 0;
+    columns.risk_level[i] = result.risk_level;
+    columns.categories[i] = result.categories || [];
+  }
+
+  /**
+   * Column-mode counterpart of _parallelBatchAnalyze; workers transfer typed array buffers
+   * @param {string[]} texts - Array of texts to analyze
+   * @param {Object[]} contexts - Array of context objects
+   * @returns {Object} Columns indexed like texts
+   */
+  async _parallelBatchAnalyzeColumns(texts, contexts) {
+    const columns = AIService.createResultColumns(texts.length);
+
+    await this._dispatchBatch(texts, contexts, true, (start, blockColumns) => {
+      for (const [field, values] of Object.entries(blockColumns)) {
+        if (ArrayBuffer.isView(values)) {
+          columns[field].set(values, start);
+        } else {
+          for (let j = 0; j < values.length; j++) columns[field][start + j] = values[j];
+        }
+      }
+    });
+
+    // Work ran in other isolates, so fold it into this instance's stats here
+    for (let i = 0; i < texts.length; i++) {
+      this.stats.total_requests++;
+      this._recordProcessingTime(columns.processing_time[i]);
+      if (columns.failed[i]) this.stats.error_count++;
+    }
+
+    return columns;
+  }
+
+  /**
+   * Spread a large batch across worker threads
+   * @param {string[]} texts - Array of texts to analyze
+   * @param {Object[]} contexts - Array of context objects
+   * @param {number} maxWorkers - Most workers the batch may use
+   * @returns {Object[]} Array of analysis results, in input order
+   */
+  async _parallelBatchAnalyze(texts, contexts, maxWorkers = Infinity) {
+    const results = new Array(texts.length);
+
+    await this._dispatchBatch(texts, contexts, false, (start, blockResults) => {
+      for (let j = 0; j < blockResults.length; j++) results[start + j] = blockResults[j];
+    }, maxWorkers);
+
+    // Work ran in other isolates, so fold it into this instance's stats here
+    for (const result of results) {
+      this.stats.total_requests++;
+      this._recordProcessingTime(result.processing_time || 0);
+      if (result.error) this.stats.error_count++;
     }
 
     return results;
   }
 
+  /**
+   * Feed a batch to worker threads through one shared queue of fixed-size blocks.
+   * Each worker pulls the next block as soon as it finishes one, so a run of long
+   * texts no longer stalls a whole contiguous chunk while other workers sit idle.
+   * @param {string[]} texts - Array of texts to analyze
+   * @param {Object[]} contexts - Array of context objects
+   * @param {boolean} columns - Ask workers for result columns instead of result objects
+   * @param {Function} onBlock - Receives (startIndex, blockPayload) for every finished block
+   * @param {number} maxWorkers - Most workers the batch may use
+   * @returns {Promise<void>} Resolves once every block has been handled
+   */
+  async _dispatchBatch(texts, contexts, columns, onBlock, maxWorkers = Infinity) {
+    // One worker per BLOCKS_IN_FLIGHT blocks; more would leave some with nothing posted
+    const wanted = Math.min(maxWorkers, Math.ceil(texts.length / (BATCH_BLOCK_SIZE * BLOCKS_IN_FLIGHT)));
+    const workers = await this._acquireBatchWorkers(wanted);
+    let nextStart = 0;
+    let activeWorkers = 0;
+    let settled = false;
+
+    return new Promise((resolve, reject) => {
+      const busyWorkers = new Set();
+      const fail = (error) => {
+        if (settled) return;
+        settled = true;
+        // A worker that failed mid-batch is not trusted back into the pool
+        busyWorkers.forEach(worker => worker.terminate());
+        reject(error);
+      };
+
+      for (const worker of workers) {
+        // Start indexes of blocks posted to this worker, oldest first
+        const inFlight = [];
+
+        const onMessage = ({ payload, stageTimings }) => {
+          if (settled) return;
+          this._mergeStageTimings(stageTimings);
+          onBlock(inFlight.shift(), payload);
+          fillWorker();
+        };
+        const onExit = (code) => fail(new Error(`Batch worker exited with code ${code}`));
+
+        // Top the worker up to BLOCKS_IN_FLIGHT posted blocks
+        const fillWorker = () => {
+          while (inFlight.length < BLOCKS_IN_FLIGHT && nextStart < texts.length) {
+            inFlight.push(nextStart);
+            worker.postMessage({
+              texts: texts.slice(nextStart, nextStart + BATCH_BLOCK_SIZE),
+              contexts: contexts.slice(nextStart, nextStart + BATCH_BLOCK_SIZE),
+              columns
+            });
+            nextStart += BATCH_BLOCK_SIZE;
+          }
+
+          if (inFlight.length === 0) {
+            // Queue drained: hand the worker back for the next batch
+            worker.off('message', onMessage);
+            worker.off('error', fail);
+            worker.off('exit', onExit);
+            busyWorkers.delete(worker);
+            this._releaseBatchWorker(worker);
+
+            if (--activeWorkers === 0 && !settled) {
+              settled = true;
+              resolve();
+            }
+          }
+        };
+
+        worker.on('message', onMessage);
+        worker.once('error', fail);
+        worker.once('exit', onExit);
+
+        busyWorkers.add(worker);
+        activeWorkers++;
+        fillWorker();
+      }
+    });
+  }
+
+  /**
+   * Take up to `wanted` batch workers from the shared pool: idle ones first, then new
+   * ones while the pool is below BATCH_POOL_SIZE. Waits for a release if none is free.
+   * Building the engines in a fresh worker costs far more than analyzing a block,
+   * so reuse keeps that cost off every batch after the first.
+   * @param {number} wanted - Workers the batch could use
+   * @returns {Promise<Worker[]>} At least one worker running aiBatchWorker.js
+   */
+  async _acquireBatchWorkers(wanted) {
+    const workers = [];
+
+    while (workers.length === 0) {
+      while (workers.length < wanted && batchWorkerPool.idle.length > 0) {
+        workers.push(batchWorkerPool.idle.pop());
+      }
+      while (workers.length < wanted && batchWorkerPool.live < BATCH_POOL_SIZE) {
+        workers.push(this._startBatchWorker());
+      }
+
+      if (workers.length === 0) {
+        await new Promise(resolve => batchWorkerPool.waiters.push(resolve));
+      }
+    }
+
+    workers.forEach(worker => worker.ref());
+    return workers;
+  }
+
+  /**
+   * Start a pooled batch worker; it leaves the pool when it exits
+   * @returns {Worker} Worker running aiBatchWorker.js
+   */
+  _startBatchWorker() {
+    const worker = new Worker(path.join(__dirname, 'aiBatchWorker.js'));
+    batchWorkerPool.live++;
+
+    worker.on('error', (error) => {
+      console.error('Batch worker error:', error);
+    });
+    worker.once('exit', () => {
+      batchWorkerPool.live--;
+      const index = batchWorkerPool.idle.indexOf(worker);
+      if (index > -1) batchWorkerPool.idle.splice(index, 1);
+      this._wakeBatchWorkerWaiter();
+    });
+
+    return worker;
+  }
+
+  /**
+   * Start a batch worker and add it to the idle pool once its engines are built.
+   * A block is answered only after the worker's start-up code has run.
+   * @param {string[]} texts - Texts for the worker to analyze (and discard) first
+   */
+  _warmBatchWorker(texts = []) {
+    const worker = this._startBatchWorker();
+    worker.once('message', () => this._releaseBatchWorker(worker));
+    worker.postMessage({ texts });
+  }
+
+  /**
+   * Prepare for traffic: run sample messages through every engine so lazily built
+   * tables and caches exist and V8 has optimized the hot code before the first real
+   * request, and start a batch worker doing the same. Statistics are reset afterwards.
+   * @returns {Promise<void>}
+   */
+  async warmUp() {
+    if (batchWorkerPool.live < BATCH_POOL_SIZE) {
+      this._warmBatchWorker(WARM_UP_TEXTS);
+    }
+
+    for (const text of WARM_UP_TEXTS) {
+      await this.analyzeContent(text);
+      await this.getRephrasingSuggestions(text);
+    }
+
+    this.resetStats();
+  }
+
+  /**
+   * Return a batch worker to the pool, where it no longer keeps the process alive
+   * @param {Worker} worker - Worker from _acquireBatchWorkers
+   */
+  _releaseBatchWorker(worker) {
+    worker.unref();
+    batchWorkerPool.idle.push(worker);
+    this._wakeBatchWorkerWaiter();
+  }
+
+  /**
+   * Let the oldest batch waiting in _acquireBatchWorkers retry
+   */
+  _wakeBatchWorkerWaiter() {
+    const waiter = batchWorkerPool.waiters.shift();
+    if (waiter) waiter();
+  }
+
   /**
    * Get rephrasing suggestions for a message
    * @param {string} text - Text to generate suggestions for
@@ -161,7 +755,10 @@ class AIService {
    */
   async getRephrasingSuggestions(text, context = {}) {
     try {
-      const result = this.rephrasingEngine.generateSuggestions(text, context);
+      // The content engine decides whether the message is harmless; its cache (keyed on
+      // platform and text) answers for a message that was just analyzed
+      const contentResult = this.contentEngine.detectAbusiveContent(text, context);
+      const result = this.rephrasingEngine.generateSuggestions(text, context, contentResult.is_abusive);
       return {
         original_message: result.original_message,
         message_type: result.message_type,
@@ -192,8 +789,8 @@ class AIService {
    * @returns {Object} Service statistics
    */
   getStats() {
-    const avgProcessingTime = this.stats.processing_times.length > 0 ?
-      this.stats.processing_times.reduce((sum, time) => sum + time, 0) / this.stats.processing_times.length : 0;
+    const avgProcessingTime = this.stats.timed_requests > 0 ?
+      this.stats.total_processing_time / this.stats.timed_requests : 0;
 
     return {
       total_requests: this.stats.total_requests,
@@ -203,6 +800,8 @@ class AIService {
         Math.round((this.stats.error_count / this.stats.total_requests) * 100) / 100 : 0,
       cache_hit_rate: this.stats.total_requests > 0 ?
         Math.round((this.stats.cache_hits / this.stats.total_requests) * 100) / 100 : 0,
+      shed_count: this.stats.shed_count,
+      stage_timings: this._summarizeStageTimings(),
       engine_stats: {
         content_engine: this.contentEngine.getStats(),
         obfuscation_detector: this.obfuscationDetector.getStats(),
@@ -213,17 +812,53 @@ class AIService {
     };
   }
 
+  /**
+   * Latency histograms in the Prometheus text exposition format: one for whole requests
+   * (cache hits included) and one per engine pass of full analyses. Counts cover this
+   * process only, including analyses its batch workers ran.
+   * @returns {string} Metrics text
+   */
+  getMetrics() {
+    const lines = [
+      '# HELP typeaware_analysis_seconds Time taken to answer an analysis request.',
+      '# TYPE typeaware_analysis_seconds histogram',
+      ...this._histogramLines('typeaware_analysis_seconds', '', this.requestTiming),
+      '# HELP typeaware_analysis_stage_seconds Time spent in each engine pass of a full analysis.',
+      '# TYPE typeaware_analysis_stage_seconds histogram'
+    ];
+    for (const stage of ANALYSIS_STAGES) {
+      lines.push(...this._histogramLines('typeaware_analysis_stage_seconds', `stage="${stage}",`, this.stageTimings[stage]));
+    }
+
+    return lines.join('\n') + '\n';
+  }
+
+  /**
+   * Hand over the stage timings gathered since the last call and start afresh.
+   * Batch workers send these to the parent with every block they finish.
+   * @returns {Object} Stage timings, by stage name
+   */
+  drainStageTimings() {
+    const stageTimings = this.stageTimings;
+    this.stageTimings = createStageTimings();
+    return stageTimings;
+  }
+
   /**
    * Reset all statistics
    */
   resetStats() {
     this.stats = {
       total_requests: 0,
-      processing_times: [],
+      timed_requests: 0,
+      total_processing_time: 0,
       error_count: 0,
       cache_hits: 0,
-      cache_misses: 0
+      cache_misses: 0,
+      shed_count: 0
     };
+    this.requestTiming = createTiming();
+    this.stageTimings = createStageTimings();
 
     this.contentEngine.resetStats();
     this.obfuscationDetector.resetStats();
@@ -261,6 +896,73 @@ class AIService {
 
   // Private helper methods
 
+  _contextCacheKey(context) {
+    // Fuzzy matching scores depend on how old context.timestamp is right now
+    if (context && context.timestamp) return null;
+
+    return context ? JSON.stringify(context) : '{}';
+  }
+
+  _cacheAnalysis(key, result) {
+    if (this.analysisCache.size >= ANALYSIS_CACHE_SIZE) {
+      // Evict the least recently used entry (first in Map order)
+      this.analysisCache.delete(this.analysisCache.keys().next().value);
+    }
+    this.analysisCache.set(key, result);
+  }
+
+  _recordProcessingTime(processingTime) {
+    this.stats.timed_requests++;
+    this.stats.total_processing_time += processingTime;
+    observeTiming(this.requestTiming, processingTime);
+  }
+
+  // Time the stage that started at stageStart; returns now, the start of the next stage
+  _recordStage(stage, stageStart) {
+    const now = performance.now();
+    observeTiming(this.stageTimings[stage], now - stageStart);
+    return now;
+  }
+
+  _mergeStageTimings(stageTimings) {
+    for (const stage of ANALYSIS_STAGES) {
+      const timing = this.stageTimings[stage];
+      const other = stageTimings[stage];
+      timing.count += other.count;
+      timing.sum += other.sum;
+      for (let bucket = 0; bucket < timing.buckets.length; bucket++) timing.buckets[bucket] += other.buckets[bucket];
+    }
+  }
+
+  _summarizeStageTimings() {
+    const summary = {};
+    for (const stage of ANALYSIS_STAGES) {
+      const timing = this.stageTimings[stage];
+      summary[stage] = {
+        count: timing.count,
+        average_ms: timing.count > 0 ? Math.round((timing.sum / timing.count) * 1000) / 1000 : 0,
+        p50_ms: timingQuantile(timing, 0.5),
+        p95_ms: timingQuantile(timing, 0.95)
+      };
+    }
+    return summary;
+  }
+
+  _histogramLines(name, labels, timing) {
+    const lines = [];
+    let cumulative = 0;
+    for (let bucket = 0; bucket < LATENCY_BUCKETS_MS.length; bucket++) {
+      cumulative += timing.buckets[bucket];
+      lines.push(`${name}_bucket{${labels}le="${LATENCY_BUCKETS_MS[bucket] / 1000}"} ${cumulative}`);
+    }
+    lines.push(`${name}_bucket{${labels}le="+Inf"} ${timing.count}`);
+
+    const plainLabels = labels ? `{${labels.slice(0, -1)}}` : '';
+    lines.push(`${name}_sum${plainLabels} ${timing.sum / 1000}`);
+    lines.push(`${name}_count${plainLabels} ${timing.count}`);
+    return lines;
+  }
+
   _extractAbusiveWords(contentResult) {
     const abusiveWords = new Set();
 
@@ -280,12 +982,7 @@ class AIService {
     }
 
     // Add common abusive words
-    const commonAbusive = [
-      'stupid', 'dumb', 'idiot', 'moron', 'loser', 'pathetic', 'worthless',
-      'fuck', 'shit', 'bitch', 'asshole', 'bastard', 'cunt', 'dick', 'pussy'
-    ];
-
-    commonAbusive.forEach(word => abusiveWords.add(word));
+    COMMON_ABUSIVE_WORDS.forEach(word => abusiveWords.add(word));
 
     return Array.from(abusiveWords);
   }
@@ -301,15 +998,14 @@ class AIService {
     const isAbusive = combinedRiskScore > 20 || contentResult.is_abusive;
 
     // Combine categories
-    const allCategories = new Set([
-      ...(contentResult.categories || []),
-      ...(patternAnalysis.patterns ? patternAnalysis.patterns.map(p => p.pattern_type) : [])
-    ]);
-
-    // Combine detections
-    const allDetections = [
-      ...(contentResult.detections || []),
-      ...obfuscationMatches.map(match => ({
+    const allCategories = new Set(contentResult.categories);
+    const patterns = patternAnalysis.patterns || [];
+    for (const pattern of patterns) allCategories.add(pattern.pattern_type);
+
+    // Combine detections, appending straight into one array instead of spreading mapped copies
+    const allDetections = contentResult.detections ? contentResult.detections.slice() : [];
+    for (const match of obfuscationMatches) {
+      allDetections.push({
         detection_type: 'obfuscation',
         category: 'obfuscation',
         severity: 3,
@@ -318,8 +1014,10 @@ class AIService {
         confidence: match.confidence,
         method: 'obfuscation_detection',
         actual_word: match.word
-      })),
-      ...fuzzyMatches.map(match => ({
+      });
+    }
+    for (const match of fuzzyMatches) {
+      allDetections.push({
         detection_type: 'fuzzy_match',
         category: 'content',
         severity: 2,
@@ -327,17 +1025,15 @@ class AIService {
         position: match.start_index,
         confidence: match.similarity,
         method: 'fuzzy_matching'
-      }))
-    ];
+      });
+    }
 
-    // Combine suggestions
-    const allSuggestions = [
-      ...(contentResult.suggestions || []),
-      ...(patternAnalysis.context?.suggestions || [])
-    ];
+    // Combine suggestions, removing duplicates as they are added
+    const allSuggestions = new Set(contentResult.suggestions);
+    for (const suggestion of patternAnalysis.context?.suggestions || []) allSuggestions.add(suggestion);
 
     if (rephrasingSuggestions && rephrasingSuggestions.suggestions) {
-      allSuggestions.push(...rephrasingSuggestions.suggestions.map(s => s.suggested_text));
+      for (const suggestion of rephrasingSuggestions.suggestions) allSuggestions.add(suggestion.suggested_text);
     }
 
     return {
@@ -345,10 +1041,10 @@ class AIService {
       risk_score: Math.round(combinedRiskScore * 100) / 100,
       risk_level: this._calculateRiskLevel(combinedRiskScore),
       detections: allDetections,
-      suggestions: [...new Set(allSuggestions)], // Remove duplicates
+      suggestions: Array.from(allSuggestions),
       categories: Array.from(allCategories),
       confidence: Math.max(contentResult.confidence || 0, patternAnalysis.confidence || 0),
-      processing_time: Date.now() - startTime,
+      processing_time: performance.now() - startTime,
       analysis_breakdown: {
         content_analysis: {
           risk_score: contentResult.risk_score,
@@ -357,7 +1053,7 @@ class AIService {
         },
         pattern_analysis: {
           risk_score: patternAnalysis.overall_risk,
-          patterns_detected: patternAnalysis.patterns?.length || 0
+          patterns_detected: patterns.length
         },
         obfuscation_detection: {
           matches_found: obfuscationMatches.length
@@ -392,7 +1088,7 @@ class AIService {
     return [...new Set(suggestions)].slice(0, 3);
   }
 
-  _createEmptyAnalysis() {
+  _createEmptyAnalysis(processingTime = 0) {
     return {
       is_abusive: false,
       risk_score: 0,
@@ -401,7 +1097,7 @@ class AIService {
       suggestions: [],
       categories: [],
       confidence: 1.0,
-      processing_time: 0,
+      processing_time: processingTime,
       analysis_breakdown: {
         content_analysis: { risk_score: 0, categories: [], detection_count: 0 },
         pattern_analysis: { risk_score: 0, patterns_detected: 0 },
@@ -412,7 +1108,7 @@ class AIService {
     };
   }
 
-  _createErrorAnalysis(text, errorMessage) {
+  _createErrorAnalysis(text, errorMessage, processingTime = 0) {
     return {
       is_abusive: false,
       risk_score: 0,
@@ -421,7 +1117,7 @@ class AIService {
       suggestions: [],
       categories: [],
       confidence: 0,
-      processing_time: 0,
+      processing_time: processingTime,
       error: errorMessage,
       analysis_breakdown: {
         content_analysis: { risk_score: 0, categories: [], detection_count: 0 },
@@ -303,16 +303,29 @@ class AnalyticsService {
 
       // Get moderation actions in last 24 hours
       const yesterday = new Date(Date.now() - 24 * 60 * 60 * 1000);
-      const recentReports = await Report.find({
-        createdAt: { $gte: yesterday },
-        status: { $in: ['confirmed', 'dismissed'] }
-      });
-
-      const moderationActions = {
-        total: recentReports.length,
-        warnings: recentReports.filter(r => r.adminReview?.decision === 'confirmed' && r.content.severity === 'medium').length,
-        bans: recentReports.filter(r => r.adminReview?.decision === 'confirmed' && r.content.severity === 'critical').length
-      };
+      // Counted per decision and severity in the database instead of loading every report
+      const actionCounts = await Report.aggregate([
+        {
+          $match: {
+            createdAt: { $gte: yesterday },
+            status: { $in: ['confirmed', 'dismissed'] }
+          }
+        },
+        {
+          $group: {
+            _id: { decision: '$adminReview.decision', severity: '$content.severity' },
+            count: { $sum: 1 }
+          }
+        }
+      ]);
+
+      const moderationActions = { total: 0, warnings: 0, bans: 0 };
+      for (const { _id, count } of actionCounts) {
+        moderationActions.total += count;
+        if (_id.decision !== 'confirmed') continue;
+        if (_id.severity === 'medium') moderationActions.warnings += count;
+        else if (_id.severity === 'critical') moderationActions.bans += count;
+      }
 
       // Get active users in last 24 hours
       const activeUsers = await User.countDocuments({
@@ -5,6 +5,63 @@
 
 const fs = require('fs').promises;
 const path = require('path');
+const { performance } = require('perf_hooks');
+
+// Leet-speak character substitutions applied during preprocessing, as a lookup table
+const OBFUSCATION_MAP = {
+  '@': 'a', '3': 'e', '1': 'i', '0': 'o', '5': 's',
+  '$': 's', '4': 'a', '7': 't', '+': 't'
+};
+
+// Preprocessed output for each ASCII code: the lowercased, leet-mapped word character,
+// or 0 when the character is a separator (punctuation or whitespace)
+const PREPROCESS_TABLE = new Uint8Array(128);
+for (let code = 0; code < 128; code++) {
+  const char = String.fromCharCode(code).toLowerCase();
+  const mapped = OBFUSCATION_MAP[char] || char;
+  PREPROCESS_TABLE[code] = /\w/.test(mapped) ? mapped.charCodeAt(0) : 0;
+}
+
+// Lookup tables shared by every engine instance (including batch worker threads)
+// Platforms where banter is expected, and the categories toned down there
+const CASUAL_PLATFORMS = new Set(['gaming', 'twitch', 'discord']);
+const CASUAL_TOLERATED_CATEGORIES = new Set(['harassment', 'cyberbullying']);
+
+const BENIGN_WHITELIST = new Set([
+  'hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening',
+  'goodbye', 'bye', 'thanks', 'thank you', 'please', 'sorry', 'excuse me',
+  'yes', 'no', 'okay', 'ok', 'sure', 'maybe', 'perhaps', 'well', 'oh',
+  'wow', 'cool', 'nice', 'great', 'awesome', 'amazing', 'fantastic',
+  'wonderful', 'excellent', 'perfect', 'good', 'fine', 'alright',
+  'how are you', 'what\'s up', 'how\'s it going', 'nice to meet you',
+  'pleasure to meet you', 'have a good day', 'take care', 'see you later',
+  'good night', 'sweet dreams', 'congratulations', 'happy birthday',
+  'merry christmas', 'happy new year', 'happy holidays', 'best wishes',
+  'good luck', 'all the best', 'cheers', 'bless you', 'welcome'
+]);
+
+const CATEGORY_SUGGESTIONS = Object.freeze({
+  harassment: "Consider using more respectful language when expressing disagreement.",
+  hate_speech: "Please avoid language that targets or discriminates against groups of people.",
+  spam: "Focus on genuine communication rather than promotional content.",
+  threats: "Express your feelings without threatening language or implications of harm.",
+  cyberbullying: "Try to communicate constructively rather than attacking the person.",
+  sexual_harassment: "Keep your communication appropriate and professional.",
+  profanity: "Consider using alternative words that are less offensive.",
+  doxxing: "Never share personal information about others without their consent.",
+  revenge_porn: "Sharing intimate images without consent is illegal and harmful.",
+  slut_shaming: "Avoid judging others based on their personal choices or relationships.",
+  body_shaming: "Everyone deserves respect regardless of their appearance.",
+  gaslighting: "Be honest and respectful in your communications.",
+  homophobia: "Respect all individuals regardless of their sexual orientation.",
+  transphobia: "Respect all individuals regardless of their gender identity.",
+  religious_intolerance: "Respect diverse beliefs and avoid religious discrimination.",
+  ageism: "Value people of all ages and life experiences.",
+  ableism: "Respect all individuals regardless of physical or mental abilities.",
+  gaming_harassment: "Keep gaming fun and respectful for everyone.",
+  political_extremism: "Engage in civil discourse even on political topics.",
+  cancel_culture: "Focus on constructive dialogue rather than public shaming."
+});
 
 class Detection {
   constructor(detectionType, category, severity, match, position, confidence, method, actualWord = null) {
@@ -42,22 +99,13 @@ class ContentDetectionEngine {
     };
 
     this.abusivePatterns = this._initializePatterns();
+    this.wordLookups = new WeakMap();
+    this.patternGates = new WeakMap();
     this.detectionCache = new Map();
-    this.maxCacheSize = 1000;
+    this.maxCacheSize = 4096;
 
     // Whitelist of common benign words/phrases that should never be flagged
-    this.benignWhitelist = new Set([
-      'hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening',
-      'goodbye', 'bye', 'thanks', 'thank you', 'please', 'sorry', 'excuse me',
-      'yes', 'no', 'okay', 'ok', 'sure', 'maybe', 'perhaps', 'well', 'oh',
-      'wow', 'cool', 'nice', 'great', 'awesome', 'amazing', 'fantastic',
-      'wonderful', 'excellent', 'perfect', 'good', 'fine', 'alright',
-      'how are you', 'what\'s up', 'how\'s it going', 'nice to meet you',
-      'pleasure to meet you', 'have a good day', 'take care', 'see you later',
-      'good night', 'sweet dreams', 'congratulations', 'happy birthday',
-      'merry christmas', 'happy new year', 'happy holidays', 'best wishes',
-      'good luck', 'all the best', 'cheers', 'bless you', 'welcome'
-    ]);
+    this.benignWhitelist = BENIGN_WHITELIST;
 
     this.stats = {
       total_scanned: 0,
@@ -100,9 +148,11 @@ class ContentDetectionEngine {
         patterns: [
           /all\s+\w+\s+are\s+(bad|evil|stupid|inferior)/gi,
           /i\s+hate\s+all\s+\w+/gi,
-          /\w+\s+people\s+are\s+(inferior|superior|dangerous)/gi,
+          // Leading \w+ runs start at a word boundary: otherwise every position inside a
+          // long word is retried and scanning becomes quadratic in its length
+          /\b\w+\s+people\s+are\s+(inferior|superior|dangerous)/gi,
           /death\s+to\s+all\s+\w+/gi,
-          /\w+\s+don\'t\s+belong\s+here/gi,
+          /\b\w+\s+don\'t\s+belong\s+here/gi,
           /go\s+back\s+to\s+your\s+country/gi
         ],
         severity: this.severityLevels.CRITICAL
@@ -445,26 +495,29 @@ class ContentDetectionEngine {
   }
 
   detectAbusiveContent(text, context = {}) {
-    const startTime = Date.now();
+    const startTime = performance.now();
 
     // Input validation
     if (!text || typeof text !== 'string') {
-      return this._createEmptyResult(Date.now() - startTime);
+      return this._createEmptyResult(performance.now() - startTime);
     }
 
     // Check if text contains only benign words/phrases
     const lowerText = text.toLowerCase().trim();
     if (this.benignWhitelist.has(lowerText) ||
         lowerText.split(/\s+/).every(word => this.benignWhitelist.has(word))) {
-      return this._createEmptyResult(Date.now() - startTime);
+      return this._createEmptyResult(performance.now() - startTime);
     }
 
     // Check cache first
     const cacheKey = this._generateCacheKey(text, context);
-    if (this.detectionCache.has(cacheKey)) {
+    const cachedResult = this.detectionCache.get(cacheKey);
+    if (cachedResult) {
       this.stats.cache_hits++;
-      const cachedResult = this.detectionCache.get(cacheKey);
-      cachedResult.processing_time = Date.now() - startTime;
+      // Re-insert so the Map's insertion order tracks recency (LRU)
+      this.detectionCache.delete(cacheKey);
+      this.detectionCache.set(cacheKey, cachedResult);
+      cachedResult.processing_time = performance.now() - startTime;
       return cachedResult;
     }
 
@@ -472,19 +525,21 @@ class ContentDetectionEngine {
 
     // Preprocess text
     const preprocessedText = this._preprocessText(text);
+    // Tokenize once; every category's word scan reuses the same token array
+    const textWords = preprocessedText.split(' ');
 
     // Run detection for each category
     const detections = [];
     for (const [category, config] of Object.entries(this.abusivePatterns)) {
       const categoryDetections = this._detectCategory(
-        preprocessedText, text, category, config, context
+        preprocessedText, text, category, config, context, textWords
       );
       detections.push(...categoryDetections);
     }
 
     // Calculate risk score and create result
     const result = this._calculateRiskScore(detections, text, context);
-    result.processing_time = Date.now() - startTime;
+    result.processing_time = performance.now() - startTime;
 
     // Update statistics
     this._updateStats(result);
@@ -496,34 +551,52 @@ class ContentDetectionEngine {
   }
 
   _preprocessText(text) {
-    // Convert to lowercase
-    text = text.toLowerCase();
-
-    // Replace common obfuscation techniques
-    const obfuscationMap = {
-      '@': 'a', '3': 'e', '1': 'i', '0': 'o', '5': 's',
-      '$': 's', '4': 'a', '7': 't', '+': 't'
-    };
+    // Single walk that lowercases, maps leet characters, turns punctuation into
+    // separators and collapses/trims whitespace. Only ASCII word characters and
+    // single spaces survive, so the result is written as latin1 bytes.
+    const out = new Uint8Array(text.length * 3);
+    let length = 0;
+    let pendingSpace = false;
+
+    for (let i = 0; i < text.length; i++) {
+      const code = text.charCodeAt(i);
+
+      if (code < 128) {
+        const mapped = PREPROCESS_TABLE[code];
+        if (mapped === 0) {
+          pendingSpace = true;
+          continue;
+        }
+        if (pendingSpace && length > 0) out[length++] = 32;
+        pendingSpace = false;
+        out[length++] = mapped;
+        continue;
+      }
 
-    for (const [char, replacement] of Object.entries(obfuscationMap)) {
-      text = text.replace(new RegExp(char.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'), 'g'), replacement);
+      // Lowercasing non-ASCII can still yield ASCII (e.g. Kelvin sign -> 'k')
+      const lower = text[i].toLowerCase();
+      for (let j = 0; j < lower.length; j++) {
+        const unit = lower.charCodeAt(j);
+        const mapped = unit < 128 ? PREPROCESS_TABLE[unit] : 0;
+        if (mapped === 0) {
+          pendingSpace = true;
+          continue;
+        }
+        if (pendingSpace && length > 0) out[length++] = 32;
+        pendingSpace = false;
+        out[length++] = mapped;
+      }
     }
 
-    // Remove excessive punctuation but keep some structure
-    text = text.replace(/[^\w\s]/g, ' ');
-
-    // Normalize whitespace
-    text = text.replace(/\s+/g, ' ').trim();
-
-    return text;
+    return Buffer.from(out.buffer, 0, length).toString('latin1');
   }
 
-  _detectCategory(preprocessedText, originalText, category, config, context) {
+  _detectCategory(preprocessedText, originalText, category, config, context, textWords = preprocessedText.split(' ')) {
     const detections = [];
 
     // Word-based detection with fuzzy matching
     const wordDetections = this._detectWords(
-      preprocessedText, config.words, category, config.severity
+      preprocessedText, config.words, category, config.severity, textWords
     );
     detections.push(...wordDetections);
 
@@ -539,16 +612,19 @@ class ContentDetectionEngine {
     return adjustedDetections;
   }
 
-  _detectWords(text, words, category, severity) {
+  _detectWords(text, words, category, severity, textWords = text.split(' ')) {
     const detections = [];
-    const textWords = text.split(' ');
+    const exactHits = this._findExactWordHits(textWords, words);
+
+    for (let w = 0; w < words.length; w++) {
+      const word = words[w];
+      const wordHits = exactHits.get(w);
 
-    for (const word of words) {
       for (let i = 0; i < textWords.length; i++) {
         const textWord = textWords[i];
 
         // Exact match
-        if (textWord === word) {
+        if (wordHits && wordHits.has(i)) {
           detections.push(new Detection(
             'word',
             category,
@@ -579,9 +655,68 @@ class ContentDetectionEngine {
     return detections;
   }
 
+  _getWordLookup(words) {
+    const cached = this.wordLookups.get(words);
+    if (cached && cached.size === words.length) {
+      return cached.lookup;
+    }
+
+    // Token -> indexes of the entries equal to it. Multi-word entries ("buy now") are
+    // left out: a single token can never equal them, so they only match fuzzily
+    const lookup = new Map();
+    words.forEach((word, index) => {
+      if (word.includes(' ')) return;
+      if (!lookup.has(word)) lookup.set(word, []);
+      lookup.get(word).push(index);
+    });
+
+    this.wordLookups.set(words, { lookup, size: words.length });
+    return lookup;
+  }
+
+  _findExactWordHits(textWords, words) {
+    const lookup = this._getWordLookup(words);
+    const hits = new Map(); // word index -> Set of token positions
+
+    for (let i = 0; i < textWords.length; i++) {
+      const wordIndexes = lookup.get(textWords[i]);
+      if (!wordIndexes) continue;
+
+      for (const wordIndex of wordIndexes) {
+        if (!hits.has(wordIndex)) hits.set(wordIndex, new Set());
+        hits.get(wordIndex).add(i);
+      }
+    }
+
+    return hits;
+  }
+
+  _getPatternGate(patterns) {
+    const cached = this.patternGates.get(patterns);
+    if (cached && cached.size === patterns.length) {
+      return cached.gate;
+    }
+
+    // One alternation over every pattern in the category: a single scan tells us
+    // whether any of them can match. Backreferences would be renumbered by the
+    // combination, so categories using them are always scanned pattern by pattern.
+    let gate = null;
+    if (patterns.length > 1 && !patterns.some(p => /\\[1-9]|\(\?</.test(p.source))) {
+      gate = new RegExp(patterns.map(p => `(?:${p.source})`).join('|'), 'i');
+    }
+
+    this.patternGates.set(patterns, { gate, size: patterns.length });
+    return gate;
+  }
+
   _detectPatterns(text, patterns, category, severity) {
     const detections = [];
 
+    const gate = this._getPatternGate(patterns);
+    if (gate && !gate.test(text)) {
+      return detections;
+    }
+
     for (const pattern of patterns) {
       const matches = [...text.matchAll(pattern)];
       for (const match of matches) {
@@ -605,70 +740,97 @@ class ContentDetectionEngine {
       return false;
     }
 
-    const similarity = this._calculateSimilarity(str1, str2);
+    // Any distance above this already puts the pair under the threshold
+    const maxDistance = Math.ceil(Math.max(str1.length, str2.length) * (1 - threshold));
+    const similarity = this._calculateSimilarity(str1, str2, maxDistance);
     return similarity >= threshold;
   }
 
-  _calculateSimilarity(str1, str2) {
+  _calculateSimilarity(str1, str2, maxDistance = Infinity) {
     // Simple Levenshtein distance-based similarity
     const longer = str1.length > str2.length ? str1 : str2;
     const shorter = str1.length > str2.length ? str2 : str1;
 
     if (longer.length === 0) return 1.0;
 
-    const distance = this._levenshteinDistance(longer, shorter);
+    const distance = this._levenshteinDistance(longer, shorter, maxDistance);
     return (longer.length - distance) / longer.length;
   }
 
-  _levenshteinDistance(str1, str2) {
-    const matrix = [];
+  /**
+   * Levenshtein distance over two rolling rows; returns maxDistance + 1 as soon as a
+   * whole row exceeds maxDistance, since later rows can only be larger
+   */
+  _levenshteinDistance(str1, str2, maxDistance = Infinity) {
+    if (Math.abs(str1.length - str2.length) > maxDistance) return maxDistance + 1;
 
-    for (let i = 0; i <= str2.length; i++) {
-      matrix[i] = [i];
-    }
+    let prev = new Array(str1.length + 1);
+    let curr = new Array(str1.length + 1);
 
     for (let j = 0; j <= str1.length; j++) {
-      matrix[0][j] = j;
+      prev[j] = j;
     }
 
     for (let i = 1; i <= str2.length; i++) {
+      const char2 = str2.charCodeAt(i - 1);
+      curr[0] = i;
+      let rowMin = i;
+
       for (let j = 1; j <= str1.length; j++) {
-        if (str2.charAt(i - 1) === str1.charAt(j - 1)) {
-          matrix[i][j] = matrix[i - 1][j - 1];
+        if (char2 === str1.charCodeAt(j - 1)) {
+          curr[j] = prev[j - 1];
         } else {
-          matrix[i][j] = Math.min(
-            matrix[i - 1][j - 1] + 1,
-            matrix[i][j - 1] + 1,
-            matrix[i - 1][j] + 1
+          curr[j] = Math.min(
+            prev[j - 1] + 1,
+            curr[j - 1] + 1,
+            prev[j] + 1
           );
         }
+        if (curr[j] < rowMin) rowMin = curr[j];
       }
+
+      if (rowMin > maxDistance) return maxDistance + 1;
+
+      const done = prev;
+      prev = curr;
+      curr = done;
     }
 
-    return matrix[str2.length][str1.length];
+    return prev[str1.length];
   }
 
   _adjustForContext(detections, context) {
-    if (!context) return detections;
+    if (!context || !context.platform) return detections;
+
+    const platform = context.platform.toLowerCase();
 
     return detections.map(detection => {
-      const adjustedDetection = { ...detection };
+      let severity = detection.severity;
 
       // Platform-specific adjustments
-      if (context.platform) {
-        const platform = context.platform.toLowerCase();
-        if (platform === 'twitter' && detection.category === 'harassment') {
-          adjustedDetection.severity = Math.max(1, Math.floor(detection.severity * 0.8));
-        } else if (platform === 'linkedin') {
-          adjustedDetection.severity = Math.min(4, Math.floor(detection.severity * 1.2));
-        } else if (['gaming', 'twitch', 'discord'].includes(platform)) {
-          if (['harassment', 'cyberbullying'].includes(detection.category)) {
-            adjustedDetection.severity = Math.max(1, Math.floor(detection.severity * 0.7));
-          }
+      if (platform === 'twitter' && detection.category === 'harassment') {
+        severity = Math.max(1, Math.floor(detection.severity * 0.8));
+      } else if (platform === 'linkedin') {
+        severity = Math.min(4, Math.floor(detection.severity * 1.2));
+      } else if (CASUAL_PLATFORMS.has(platform)) {
+        if (CASUAL_TOLERATED_CATEGORIES.has(detection.category)) {
+          severity = Math.max(1, Math.floor(detection.severity * 0.7));
         }
       }
 
-      return adjustedDetection;
+      if (severity === detection.severity) return detection;
+
+      // Copy through the constructor (not a spread) so every detection keeps Detection's shape
+      return new Detection(
+        detection.detection_type,
+        detection.category,
+        severity,
+        detection.match,
+        detection.position,
+        detection.confidence,
+        detection.method,
+        detection.actual_word
+      );
     });
   }
 
@@ -677,13 +839,23 @@ class ContentDetectionEngine {
       return this._createEmptyResult(0);
     }
 
+    // Aggregate severity, confidence and categories in one pass over the detections
+    let totalSeverity = 0;
+    let totalConfidence = 0;
+    const categorySet = new Set();
+    for (const d of detections) {
+      totalSeverity += d.severity * d.confidence;
+      totalConfidence += d.confidence;
+      categorySet.add(d.category);
+    }
+
     // Calculate base risk score
-    const totalSeverity = detections.reduce((sum, d) => sum + (d.severity * d.confidence), 0);
     const maxPossibleSeverity = detections.length * 4;
     const baseScore = maxPossibleSeverity > 0 ? (totalSeverity / maxPossibleSeverity) * 100 : 0;
 
-    // Adjust for detection density
-    const textLength = text.split(' ').length;
+    // Adjust for detection density (word count = spaces + 1, without splitting)
+    let textLength = 1;
+    for (let i = text.indexOf(' '); i !== -1; i = text.indexOf(' ', i + 1)) textLength++;
     const detectionDensity = detections.length / textLength;
     const densityMultiplier = Math.min(1.5, 1 + (detectionDensity * 2));
 
@@ -698,10 +870,10 @@ class ContentDetectionEngine {
     else riskLevel = 'NONE';
 
     // Extract unique categories
-    const categories = [...new Set(detections.map(d => d.category))];
+    const categories = [...categorySet];
 
     // Calculate overall confidence
-    const avgConfidence = detections.reduce((sum, d) => sum + d.confidence, 0) / detections.length;
+    const avgConfidence = totalConfidence / detections.length;
 
     // Generate suggestions
     const suggestions = this._generateSuggestions(detections, text);
@@ -722,32 +894,9 @@ class ContentDetectionEngine {
     const suggestions = [];
     const categories = new Set(detections.map(d => d.category));
 
-    const suggestionMap = {
-      harassment: "Consider using more respectful language when expressing disagreement.",
-      hate_speech: "Please avoid language that targets or discriminates against groups of people.",
-      spam: "Focus on genuine communication rather than promotional content.",
-      threats: "Express your feelings without threatening language or implications of harm.",
-      cyberbullying: "Try to communicate constructively rather than attacking the person.",
-      sexual_harassment: "Keep your communication appropriate and professional.",
-      profanity: "Consider using alternative words that are less offensive.",
-      doxxing: "Never share personal information about others without their consent.",
-      revenge_porn: "Sharing intimate images without consent is illegal and harmful.",
-      slut_shaming: "Avoid judging others based on their personal choices or relationships.",
-      body_shaming: "Everyone deserves respect regardless of their appearance.",
-      gaslighting: "Be honest and respectful in your communications.",
-      homophobia: "Respect all individuals regardless of their sexual orientation.",
-      transphobia: "Respect all individuals regardless of their gender identity.",
-      religious_intolerance: "Respect diverse beliefs and avoid religious discrimination.",
-      ageism: "Value people of all ages and life experiences.",
-      ableism: "Respect all individuals regardless of physical or mental abilities.",
-      gaming_harassment: "Keep gaming fun and respectful for everyone.",
-      political_extremism: "Engage in civil discourse even on political topics.",
-      cancel_culture: "Focus on constructive dialogue rather than public shaming."
-    };
-
     for (const category of categories) {
-      if (suggestionMap[category]) {
-        suggestions.push(suggestionMap[category]);
+      if (CATEGORY_SUGGESTIONS[category]) {
+        suggestions.push(CATEGORY_SUGGESTIONS[category]);
       }
     }
 
@@ -768,19 +917,16 @@ class ContentDetectionEngine {
   }
 
   _generateCacheKey(text, context) {
-    const contextStr = context ? JSON.stringify(context) : "{}";
-    return `${text.substring(0, 100).split('').reduce((a, b) => {
-      a = ((a << 5) - a) + b.charCodeAt(0);
-      return a & a;
-    }, 0)}_${contextStr.split('').reduce((a, b) => {
-      a = ((a << 5) - a) + b.charCodeAt(0);
-      return a & a;
-    }, 0)}`;
+    // Key on the full text so messages sharing a 100-char prefix never collide;
+    // Map already hashes string keys natively. Platform is the only part of the
+    // context detection reads, so per-message fields (timestamps, ids) don't split the cache
+    const platform = (context && context.platform) || '';
+    return `${platform}\u0000${text}`;
   }
 
   _cacheResult(key, result) {
     if (this.detectionCache.size >= this.maxCacheSize) {
-      // Remove oldest entry (simple FIFO)
+      // Evict the least recently used entry (first in Map order)
       const firstKey = this.detectionCache.keys().next().value;
       this.detectionCache.delete(firstKey);
     }
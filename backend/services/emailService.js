@@ -1,7 +1,10 @@
 const nodemailer = require('nodemailer');
 const fs = require('fs/promises');
 const path = require('path');
-const handlebars = require('handlebars');
+
+// handlebars pulls in its whole template compiler, which only mail rendering needs;
+// load it on first use instead of on every server start
+let handlebars = null;
 
 class EmailService {
   /**
@@ -82,6 +85,7 @@ class EmailService {
         fs.readFile(path.join(templatePath, 'text.hbs'), 'utf-8'),
       ]);
 
+      handlebars = handlebars || require('handlebars');
       const compile = (template) => handlebars.compile(template)(data);
 
       return {
@@ -256,8 +260,10 @@ class EmailService {
 
     const results = [];
     const batchSize = 10; // Send emails in batches to avoid rate limiting
+    const batchIntervalMs = 1000; // At most one batch started per interval
 
     for (let i = 0; i < recipients.length; i += batchSize) {
+      const batchStartedAt = Date.now();
       const batch = recipients.slice(i, i + batchSize);
       const batchPromises = batch.map(recipient =>
         this.send(recipient.email, template, { ...data, ...recipient })
@@ -267,9 +273,11 @@ class EmailService {
         const batchResults = await Promise.all(batchPromises);
         results.push(...batchResults);
 
-        // Add delay between batches
-        if (i + batchSize < recipients.length) {
-          await new Promise(resolve => setTimeout(resolve, 1000));
+        // Wait out only what is left of the interval; slow SMTP round trips
+        // already count towards the spacing between batches
+        const remainingMs = batchIntervalMs - (Date.now() - batchStartedAt);
+        if (i + batchSize < recipients.length && remainingMs > 0) {
+          await new Promise(resolve => setTimeout(resolve, remainingMs));
         }
       } catch (error) {
         console.error('Error sending bulk email batch:', error);
@@ -3,6 +3,173 @@
  * Includes phonetic matching, Damerau-Levenshtein distance, and improved context awareness
  */
 
+// Scratch presence table indexed by UTF-16 code unit (bit 1 = seen in first string,
+// bit 2 = seen in second). Cleared after every use so it can be shared.
+const charPresence = new Uint8Array(65536);
+
+// Scratch DP rows shared by the edit-distance kernels, grown on demand, so a distance
+// needs neither a matrix nor any allocation per call
+let distanceRows = [new Int32Array(64), new Int32Array(64), new Int32Array(64)];
+
+function getDistanceRows(length) {
+  if (distanceRows[0].length < length) {
+    const size = Math.max(length, distanceRows[0].length * 2);
+    distanceRows = [new Int32Array(size), new Int32Array(size), new Int32Array(size)];
+  }
+  return distanceRows;
+}
+
+// The kernels below read code units out of Uint16Arrays, so a window of the scanned
+// text is just (view.codes, start, length) and never has to be cut out as a string
+function toCodes(str) {
+  const codes = new Uint16Array(str.length);
+  for (let i = 0; i < str.length; i++) codes[i] = str.charCodeAt(i);
+  return codes;
+}
+
+// Scratch code buffers for strings passed to the distance methods directly
+let stringCodes = [new Uint16Array(64), new Uint16Array(64)];
+
+function scratchCodes(str, slot) {
+  if (stringCodes[slot].length < str.length) {
+    stringCodes[slot] = new Uint16Array(Math.max(str.length, stringCodes[slot].length * 2));
+  }
+  const codes = stringCodes[slot];
+  for (let i = 0; i < str.length; i++) codes[i] = str.charCodeAt(i);
+  return codes;
+}
+
+// Levenshtein distance between codes1[start1, start1 + len1) and codes2[start2, start2 + len2).
+// Once every entry of a row exceeds maxDistance the result can only grow, so
+// maxDistance + 1 is returned early instead.
+function levenshteinCodes(codes1, start1, len1, codes2, start2, len2, maxDistance) {
+  if (Math.abs(len1 - len2) > maxDistance) return maxDistance + 1;
+
+  const rows = getDistanceRows(len1 + 1);
+  let prev = rows[0];
+  let curr = rows[1];
+
+  for (let j = 0; j <= len1; j++) prev[j] = j;
+
+  for (let i = 1; i <= len2; i++) {
+    const code2 = codes2[start2 + i - 1];
+    curr[0] = i;
+    let rowMin = i;
+
+    for (let j = 1; j <= len1; j++) {
+      if (code2 === codes1[start1 + j - 1]) {
+        curr[j] = prev[j - 1];
+      } else {
+        let best = prev[j - 1];
+        if (curr[j - 1] < best) best = curr[j - 1];
+        if (prev[j] < best) best = prev[j];
+        curr[j] = best + 1;
+      }
+      if (curr[j] < rowMin) rowMin = curr[j];
+    }
+
+    if (rowMin > maxDistance) return maxDistance + 1;
+
+    const done = prev;
+    prev = curr;
+    curr = done;
+  }
+
+  return prev[len1];
+}
+
+// Damerau-Levenshtein (optimal string alignment) distance over the same kind of ranges,
+// with the same early exit; a transposition reaches back two rows, so both of the last
+// two rows must be out of range before the result is known to exceed maxDistance
+function damerauCodes(codes1, start1, len1, codes2, start2, len2, maxDistance) {
+  if (Math.abs(len1 - len2) > maxDistance) return maxDistance + 1;
+
+  const rows = getDistanceRows(len2 + 1);
+  // Rows i - 2, i - 1 and i of the DP matrix
+  let beforePrev = rows[0];
+  let prev = rows[1];
+  let curr = rows[2];
+
+  for (let j = 0; j <= len2; j++) prev[j] = j;
+  let prevRowMin = 0;
+
+  for (let i = 1; i <= len1; i++) {
+    const code1 = codes1[start1 + i - 1];
+    const prevCode1 = i > 1 ? codes1[start1 + i - 2] : -1;
+    curr[0] = i;
+    let rowMin = i;
+
+    for (let j = 1; j <= len2; j++) {
+      const code2 = codes2[start2 + j - 1];
+      const cost = code1 === code2 ? 0 : 1;
+
+      let best = prev[j] + 1; // deletion
+      if (curr[j - 1] + 1 < best) best = curr[j - 1] + 1; // insertion
+      if (prev[j - 1] + cost < best) best = prev[j - 1] + cost; // substitution
+
+      // Transposition check
+      if (i > 1 && j > 1 && code1 === codes2[start2 + j - 2] && prevCode1 === code2 &&
+          beforePrev[j - 2] + cost < best) {
+        best = beforePrev[j - 2] + cost;
+      }
+
+      curr[j] = best;
+      if (best < rowMin) rowMin = best;
+    }
+
+    // A transposition costs one on top of row i - 2, so later rows stay above
+    // maxDistance once this row does and the previous one is at least maxDistance
+    if (rowMin > maxDistance && prevRowMin >= maxDistance) return maxDistance + 1;
+    prevRowMin = rowMin;
+
+    const done = beforePrev;
+    beforePrev = prev;
+    prev = curr;
+    curr = done;
+  }
+
+  return prev[len2];
+}
+
+// Jaccard index of the character sets of two ranges (already lowercased)
+function jaccardCodes(codes1, start1, len1, codes2, start2, len2) {
+  let size1 = 0;
+  let size2 = 0;
+  let intersection = 0;
+
+  for (let i = start1; i < start1 + len1; i++) {
+    const code = codes1[i];
+    if (!(charPresence[code] & 1)) {
+      charPresence[code] |= 1;
+      size1++;
+    }
+  }
+
+  for (let i = start2; i < start2 + len2; i++) {
+    const code = codes2[i];
+    if (!(charPresence[code] & 2)) {
+      charPresence[code] |= 2;
+      size2++;
+      if (charPresence[code] & 1) intersection++;
+    }
+  }
+
+  for (let i = start1; i < start1 + len1; i++) charPresence[codes1[i]] = 0;
+  for (let i = start2; i < start2 + len2; i++) charPresence[codes2[i]] = 0;
+
+  return intersection / (size1 + size2 - intersection);
+}
+
+// Soundex mapping
+const SOUNDEX_MAP = Object.freeze({
+  'B': '1', 'F': '1', 'P': '1', 'V': '1',
+  'C': '2', 'G': '2', 'J': '2', 'K': '2', 'Q': '2', 'S': '2', 'X': '2', 'Z': '2',
+  'D': '3', 'T': '3',
+  'L': '4',
+  'M': '5', 'N': '5',
+  'R': '6'
+});
+
 class FuzzyMatch {
   constructor(text, pattern, similarity, startIndex, endIndex, method) {
     this.text = text;
@@ -18,6 +185,11 @@ class FuzzyMatcher {
   constructor(minSimilarity = 0.6) {
     this.minSimilarity = minSimilarity;
 
+    // Per-pattern preprocessing (see _getPatternProfile); the abusive word list is
+    // largely the same on every call, so it is built once per word
+    this.patternProfiles = new Map();
+    this.maxPatternProfiles = 1000;
+
     this.stats = {
       total_searches: 0,
       matches_found: 0,
@@ -29,7 +201,7 @@ class FuzzyMatcher {
     console.log(`Enhanced FuzzyMatcher initialized with min similarity: ${minSimilarity}`);
   }
 
-  findFuzzyMatches(text, patterns, contextSize = 10) {
+  findFuzzyMatches(text, patterns, contextSize = 10, lowerText = null) {
     this.stats.total_searches++;
 
     try {
@@ -38,10 +210,11 @@ class FuzzyMatcher {
       }
 
       const matches = [];
-      const lowerText = text.toLowerCase();
+      lowerText = lowerText || text.toLowerCase();
+      const view = this._createTextView(lowerText, text);
 
       for (const pattern of patterns) {
-        const patternMatches = this._findPatternMatches(lowerText, pattern, text, contextSize);
+        const patternMatches = this._findPatternMatches(lowerText, pattern, text, contextSize, view);
         matches.push(...patternMatches);
       }
 
@@ -83,44 +256,85 @@ class FuzzyMatcher {
     }
   }
 
-  _findPatternMatches(text, pattern, originalText, contextSize) {
+  // Per-text work shared by every pattern searched in one findFuzzyMatches call
+  _createTextView(text, originalText) {
+    const words = text.split(/\s+/);
+    return {
+      codes: toCodes(text),
+      words,
+      originalWords: originalText.split(/\s+/),
+      wordSoundex: words.map(word => this._soundex(word)),
+      windowNgrams: new Map() // `${n}:${windowLength}` -> ngram Set per window start
+    };
+  }
+
+  _findPatternMatches(text, pattern, originalText, contextSize, view = this._createTextView(text, originalText)) {
     const matches = [];
-    const lowerPattern = pattern.toLowerCase();
+    const profile = this._getPatternProfile(pattern);
+    const lowerPattern = profile.lower;
 
     // Method 1: Sliding window comparison
-    const windowMatches = this._slidingWindowMatch(text, lowerPattern, originalText, contextSize);
+    const windowMatches = this._slidingWindowMatch(text, lowerPattern, originalText, contextSize, view, profile);
     matches.push(...windowMatches);
 
     // Method 2: N-gram similarity (multiple n values)
-    const ngramMatches = this._ngramMatch(text, lowerPattern, originalText, contextSize);
+    const ngramMatches = this._ngramMatch(text, lowerPattern, originalText, contextSize, view, profile);
     matches.push(...ngramMatches);
 
     // Method 3: Edit distance based (Levenshtein + Damerau-Levenshtein)
-    const editMatches = this._editDistanceMatch(text, lowerPattern, originalText, contextSize);
+    const editMatches = this._editDistanceMatch(text, lowerPattern, originalText, contextSize, view, profile);
     matches.push(...editMatches);
 
     // Method 4: Phonetic matching (Soundex)
-    const phoneticMatches = this._phoneticMatch(text, lowerPattern, originalText, contextSize);
+    const phoneticMatches = this._phoneticMatch(text, lowerPattern, originalText, contextSize, view, profile);
     matches.push(...phoneticMatches);
 
     // Method 5: Fuzzy substring matching
-    const substringMatches = this._fuzzySubstringMatch(text, lowerPattern, originalText, contextSize);
+    const substringMatches = this._fuzzySubstringMatch(text, lowerPattern, originalText, contextSize, view, profile);
     matches.push(...substringMatches);
 
     return matches;
   }
 
-  _slidingWindowMatch(text, pattern, originalText, contextSize) {
+  // Everything the matching methods derive from a pattern alone, built once per pattern
+  _getPatternProfile(pattern) {
+    let profile = this.patternProfiles.get(pattern);
+
+    if (!profile) {
+      const lower = pattern.toLowerCase();
+      profile = {
+        lower,
+        codes: toCodes(lower),
+        ngrams: { 2: new Set(this._generateNgrams(lower, 2)), 3: new Set(this._generateNgrams(lower, 3)) },
+        soundex: this._soundex(lower)
+      };
+
+      if (this.patternProfiles.size >= this.maxPatternProfiles) {
+        // Remove oldest entry (simple FIFO)
+        this.patternProfiles.delete(this.patternProfiles.keys().next().value);
+      }
+      this.patternProfiles.set(pattern, profile);
+    }
+
+    return profile;
+  }
+
+  _slidingWindowMatch(text, pattern, originalText, contextSize, view = this._createTextView(text, originalText),
+    profile = this._getPatternProfile(pattern)) {
     const matches = [];
     const patternLen = pattern.length;
     const textLen = text.length;
 
     if (patternLen === 0 || textLen === 0) return matches;
 
-    // Use sliding window of pattern length
+    const patternCodes = profile.codes;
+
+    // Use sliding window of pattern length; same measure as _calculateSimilarity
     for (let i = 0; i <= textLen - patternLen; i++) {
-      const window = text.substring(i, i + patternLen);
-      const similarity = this._calculateSimilarity(window, pattern);
+      const distance = levenshteinCodes(view.codes, i, patternLen, patternCodes, 0, patternLen, Infinity);
+      const levenshtein = 1 - (distance / patternLen);
+      const jaccard = jaccardCodes(view.codes, i, patternLen, patternCodes, 0, patternLen);
+      const similarity = (levenshtein * 0.7) + (jaccard * 0.3);
 
       if (similarity >= this.minSimilarity) {
         const startIdx = i;
@@ -141,22 +355,23 @@ class FuzzyMatcher {
     return matches;
   }
 
-  _ngramMatch(text, pattern, originalText, contextSize) {
+  _ngramMatch(text, pattern, originalText, contextSize, view = this._createTextView(text, originalText),
+    profile = this._getPatternProfile(pattern)) {
     const matches = [];
     const nValues = [2, 3]; // bigram and trigram similarity
 
     for (const n of nValues) {
-      const textNgrams = this._generateNgrams(text, n);
-      const patternNgrams = this._generateNgrams(pattern, n);
+      const patternNgrams = profile.ngrams[n];
 
-      if (textNgrams.length === 0 || patternNgrams.length === 0) continue;
+      if (text.length < n || patternNgrams.size === 0) continue;
 
-      // Find positions where ngram similarity is high
-      for (let i = 0; i <= text.length - pattern.length; i++) {
-        const window = text.substring(i, i + pattern.length);
-        const windowNgrams = this._generateNgrams(window, n);
+      // Window ngrams depend only on the text and window length, so patterns of
+      // the same length reuse them
+      const windows = this._windowNgramSets(view, text, n, pattern.length);
 
-        const similarity = this._ngramSimilarity(windowNgrams, patternNgrams);
+      // Find positions where ngram similarity is high
+      for (let i = 0; i < windows.length; i++) {
+        const similarity = this._ngramSetSimilarity(windows[i], patternNgrams);
 
         if (similarity >= this.minSimilarity) {
           const startIdx = i;
@@ -178,8 +393,10 @@ class FuzzyMatcher {
     return matches;
   }
 
-  _editDistanceMatch(text, pattern, originalText, contextSize) {
+  _editDistanceMatch(text, pattern, originalText, contextSize, view = this._createTextView(text, originalText),
+    profile = this._getPatternProfile(pattern)) {
     const matches = [];
+    const patternCodes = profile.codes;
     const maxDistance = Math.floor(pattern.length * (1 - this.minSimilarity));
 
     // Check substrings of similar length
@@ -187,14 +404,15 @@ class FuzzyMatcher {
     const maxLen = pattern.length + maxDistance;
 
     for (let len = minLen; len <= maxLen; len++) {
-      for (let i = 0; i <= text.length - len; i++) {
-        const substring = text.substring(i, i + len);
-        const levenshteinDist = this._levenshteinDistance(substring, pattern);
-        const damerauDist = this._damerauLevenshteinDistance(substring, pattern);
+      const maxPossibleDistance = Math.max(len, pattern.length);
+      // Windows further than this from the pattern can never reach minSimilarity,
+      // so the distance kernel may stop as soon as it proves that
+      const cutoff = Math.ceil(maxPossibleDistance * (1 - this.minSimilarity));
 
-        // Use the minimum of both distances
-        const distance = Math.min(levenshteinDist, damerauDist);
-        const maxPossibleDistance = Math.max(substring.length, pattern.length);
+      for (let i = 0; i <= text.length - len; i++) {
+        // Damerau (optimal string alignment) is never larger than plain Levenshtein,
+        // so it alone is the minimum of both distances
+        const distance = damerauCodes(view.codes, i, len, patternCodes, 0, pattern.length, cutoff);
         const similarity = 1 - (distance / maxPossibleDistance);
 
         if (similarity >= this.minSimilarity) {
@@ -217,19 +435,19 @@ class FuzzyMatcher {
     return matches;
   }
 
-  _phoneticMatch(text, pattern, originalText, contextSize) {
+  _phoneticMatch(text, pattern, originalText, contextSize, view = this._createTextView(text, originalText),
+    profile = this._getPatternProfile(pattern)) {
     const matches = [];
-    const patternSoundex = this._soundex(pattern);
+    const patternSoundex = profile.soundex;
 
     if (!patternSoundex) return matches;
 
     // Find words that sound similar
-    const words = text.split(/\s+/);
-    const originalWords = originalText.split(/\s+/);
+    const { words, originalWords } = view;
 
     for (let i = 0; i < words.length; i++) {
       const word = words[i];
-      const wordSoundex = this._soundex(word);
+      const wordSoundex = view.wordSoundex[i];
 
       if (wordSoundex && wordSoundex === patternSoundex) {
         const startIdx = originalText.indexOf(originalWords[i]);
@@ -256,15 +474,27 @@ class FuzzyMatcher {
     return matches;
   }
 
-  _fuzzySubstringMatch(text, pattern, originalText, contextSize) {
+  _fuzzySubstringMatch(text, pattern, originalText, contextSize, view = this._createTextView(text, originalText),
+    profile = this._getPatternProfile(pattern)) {
     const matches = [];
     const patternLen = pattern.length;
+    const patternCodes = profile.codes;
+    const patternBigrams = profile.ngrams[2];
 
     // Use different window sizes for more flexible matching
     for (let windowSize = Math.max(1, patternLen - 2); windowSize <= patternLen + 2; windowSize++) {
+      // Bigram sets of the text's windows, shared with every other pattern (and the
+      // ngram pass) that looks at windows of this size
+      const windowBigrams = this._windowNgramSets(view, text, 2, windowSize);
+      const maxLength = Math.max(windowSize, patternLen);
+
+      // Same measure as _calculateAdvancedSimilarity, computed on the shared code buffer
       for (let i = 0; i <= text.length - windowSize; i++) {
-        const substring = text.substring(i, i + windowSize);
-        const similarity = this._calculateAdvancedSimilarity(substring, pattern);
+        const levenshtein = 1 - (levenshteinCodes(view.codes, i, windowSize, patternCodes, 0, patternLen, Infinity) / maxLength);
+        const damerau = 1 - (damerauCodes(view.codes, i, windowSize, patternCodes, 0, patternLen, Infinity) / maxLength);
+        const jaccard = jaccardCodes(view.codes, i, windowSize, patternCodes, 0, patternLen);
+        const ngramSim = this._ngramSetSimilarity(windowBigrams[i], patternBigrams);
+        const similarity = (levenshtein * 0.3) + (damerau * 0.3) + (jaccard * 0.2) + (ngramSim * 0.2);
 
         if (similarity >= this.minSimilarity) {
           const startIdx = i;
@@ -294,14 +524,33 @@ class FuzzyMatcher {
     return ngrams;
   }
 
+  _windowNgramSets(view, text, n, windowLength) {
+    const key = `${n}:${windowLength}`;
+    let windows = view.windowNgrams.get(key);
+
+    if (!windows) {
+      windows = [];
+      for (let i = 0; i <= text.length - windowLength; i++) {
+        windows.push(new Set(this._generateNgrams(text.substring(i, i + windowLength), n)));
+      }
+      view.windowNgrams.set(key, windows);
+    }
+
+    return windows;
+  }
+
   _ngramSimilarity(ngrams1, ngrams2) {
-    const set1 = new Set(ngrams1);
-    const set2 = new Set(ngrams2);
+    return this._ngramSetSimilarity(new Set(ngrams1), new Set(ngrams2));
+  }
 
-    const intersection = new Set([...set1].filter(x => set2.has(x)));
-    const union = new Set([...set1, ...set2]);
+  // Jaccard index of two ngram Sets, without building the intersection and union Sets
+  _ngramSetSimilarity(set1, set2) {
+    let intersection = 0;
+    for (const ngram of set1) {
+      if (set2.has(ngram)) intersection++;
+    }
 
-    return intersection.size / union.size;
+    return intersection / (set1.size + set2.size - intersection);
   }
 
   _calculateSimilarity(str1, str2) {
@@ -327,69 +576,29 @@ class FuzzyMatcher {
     return (levenshtein * 0.3) + (damerau * 0.3) + (jaccard * 0.2) + (ngramSim * 0.2);
   }
 
-  _levenshteinDistance(str1, str2) {
-    const matrix = [];
-
-    for (let i = 0; i <= str2.length; i++) {
-      matrix[i] = [i];
-    }
-
-    for (let j = 0; j <= str1.length; j++) {
-      matrix[0][j] = j;
-    }
-
-    for (let i = 1; i <= str2.length; i++) {
-      for (let j = 1; j <= str1.length; j++) {
-        if (str2.charAt(i - 1) === str1.charAt(j - 1)) {
-          matrix[i][j] = matrix[i - 1][j - 1];
-        } else {
-          matrix[i][j] = Math.min(
-            matrix[i - 1][j - 1] + 1,
-            matrix[i][j - 1] + 1,
-            matrix[i - 1][j] + 1
-          );
-        }
-      }
-    }
-
-    return matrix[str2.length][str1.length];
+  _levenshteinDistance(str1, str2, maxDistance = Infinity) {
+    return levenshteinCodes(
+      scratchCodes(str1, 0), 0, str1.length,
+      scratchCodes(str2, 1), 0, str2.length,
+      maxDistance
+    );
   }
 
-  _damerauLevenshteinDistance(str1, str2) {
-    const len1 = str1.length;
-    const len2 = str2.length;
-    const matrix = Array(len1 + 1).fill().map(() => Array(len2 + 1).fill(0));
-
-    for (let i = 0; i <= len1; i++) matrix[i][0] = i;
-    for (let j = 0; j <= len2; j++) matrix[0][j] = j;
-
-    for (let i = 1; i <= len1; i++) {
-      for (let j = 1; j <= len2; j++) {
-        const cost = str1[i - 1] === str2[j - 1] ? 0 : 1;
-        matrix[i][j] = Math.min(
-          matrix[i - 1][j] + 1,      // deletion
-          matrix[i][j - 1] + 1,      // insertion
-          matrix[i - 1][j - 1] + cost // substitution
-        );
-
-        // Transposition check
-        if (i > 1 && j > 1 && str1[i - 1] === str2[j - 2] && str1[i - 2] === str2[j - 1]) {
-          matrix[i][j] = Math.min(matrix[i][j], matrix[i - 2][j - 2] + cost);
-        }
-      }
-    }
-
-    return matrix[len1][len2];
+  _damerauLevenshteinDistance(str1, str2, maxDistance = Infinity) {
+    return damerauCodes(
+      scratchCodes(str1, 0), 0, str1.length,
+      scratchCodes(str2, 1), 0, str2.length,
+      maxDistance
+    );
   }
 
   _jaccardSimilarity(str1, str2) {
-    const set1 = new Set(str1.toLowerCase().split(''));
-    const set2 = new Set(str2.toLowerCase().split(''));
-
-    const intersection = new Set([...set1].filter(x => set2.has(x)));
-    const union = new Set([...set1, ...set2]);
-
-    return intersection.size / union.size;
+    const lower1 = str1.toLowerCase();
+    const lower2 = str2.toLowerCase();
+    return jaccardCodes(
+      scratchCodes(lower1, 0), 0, lower1.length,
+      scratchCodes(lower2, 1), 0, lower2.length
+    );
   }
 
   _soundex(word) {
@@ -398,22 +607,12 @@ class FuzzyMatcher {
     const wordUpper = word.toUpperCase();
     const firstLetter = wordUpper[0];
 
-    // Soundex mapping
-    const soundexMap = {
-      'B': '1', 'F': '1', 'P': '1', 'V': '1',
-      'C': '2', 'G': '2', 'J': '2', 'K': '2', 'Q': '2', 'S': '2', 'X': '2', 'Z': '2',
-      'D': '3', 'T': '3',
-      'L': '4',
-      'M': '5', 'N': '5',
-      'R': '6'
-    };
-
     let soundex = firstLetter;
-    let previousCode = soundexMap[firstLetter] || '';
+    let previousCode = SOUNDEX_MAP[firstLetter] || '';
 
     for (let i = 1; i < wordUpper.length && soundex.length < 4; i++) {
       const char = wordUpper[i];
-      const code = soundexMap[char];
+      const code = SOUNDEX_MAP[char];
 
       if (code && code !== previousCode) {
         soundex += code;
@@ -461,48 +660,55 @@ class FuzzyMatcher {
   }
 
   // Advanced fuzzy matching with context awareness
-  findContextAwareMatches(text, patterns, context = {}) {
-    const baseMatches = this.findFuzzyMatches(text, patterns);
+  findContextAwareMatches(text, patterns, context = {}, lowerText = null) {
+    const baseMatches = this.findFuzzyMatches(text, patterns, 10, lowerText);
 
     if (!context || !baseMatches.length) return baseMatches;
 
-    // Adjust similarity based on context
-    return baseMatches.map(match => {
-      let adjustedSimilarity = match.similarity;
-
-      // Platform-specific adjustments
-      if (context.platform) {
-        const platform = context.platform.toLowerCase();
-        if (platform === 'gaming' || platform === 'twitch') {
-          // Gaming platforms often have more informal language
-          adjustedSimilarity *= 0.9;
-        } else if (platform === 'professional' || platform === 'linkedin') {
-          // Professional platforms have stricter standards
-          adjustedSimilarity *= 1.1;
-        }
+    // The context is the same for every match, so work out which adjustments
+    // apply once and only replay the multipliers per match
+    const factors = [];
+
+    // Platform-specific adjustments
+    if (context.platform) {
+      const platform = context.platform.toLowerCase();
+      if (platform === 'gaming' || platform === 'twitch') {
+        // Gaming platforms often have more informal language
+        factors.push(0.9);
+      } else if (platform === 'professional' || platform === 'linkedin') {
+        // Professional platforms have stricter standards
+        factors.push(1.1);
       }
+    }
 
-      // User history adjustments
-      if (context.userHistory && context.userHistory.frequentTypos) {
-        adjustedSimilarity *= 1.05; // Slightly more lenient for users with frequent typos
-      }
+    // User history adjustments
+    if (context.userHistory && context.userHistory.frequentTypos) {
+      factors.push(1.05); // Slightly more lenient for users with frequent typos
+    }
 
-      // Content type adjustments
-      if (context.contentType === 'code' || context.contentType === 'technical') {
-        adjustedSimilarity *= 0.8; // More strict for technical content
-      }
+    // Content type adjustments
+    if (context.contentType === 'code' || context.contentType === 'technical') {
+      factors.push(0.8); // More strict for technical content
+    }
 
-      // Language adjustments
-      if (context.language && context.language !== 'en') {
-        adjustedSimilarity *= 0.95; // Slightly more lenient for non-English content
+    // Language adjustments
+    if (context.language && context.language !== 'en') {
+      factors.push(0.95); // Slightly more lenient for non-English content
+    }
+
+    // Time-based adjustments (recent content might be more lenient)
+    if (context.timestamp) {
+      const ageInHours = (Date.now() - context.timestamp) / (1000 * 60 * 60);
+      if (ageInHours < 24) {
+        factors.push(0.98); // Slightly more lenient for very recent content
       }
+    }
 
-      // Time-based adjustments (recent content might be more lenient)
-      if (context.timestamp) {
-        const ageInHours = (Date.now() - context.timestamp) / (1000 * 60 * 60);
-        if (ageInHours < 24) {
-          adjustedSimilarity *= 0.98; // Slightly more lenient for very recent content
-        }
+    // Adjust similarity based on context
+    return baseMatches.map(match => {
+      let adjustedSimilarity = match.similarity;
+      for (const factor of factors) {
+        adjustedSimilarity *= factor;
       }
 
       return new FuzzyMatch(
@@ -3,6 +3,92 @@
  * Detects attempts to hide abusive language through various obfuscation techniques
  */
 
+// Base confidence by technique
+const TECHNIQUE_WEIGHTS = Object.freeze({
+  leet_speak: 0.8,
+  repetition: 0.6,
+  spacing: 0.9,
+  homoglyphs: 0.7,
+  case_variation: 0.5,
+  fragmentation: 0.8
+});
+
+// Hidden or unusual characters flagged by detectAdvancedObfuscation
+const ADVANCED_OBFUSCATION_PATTERNS = [
+  // Zero-width characters
+  /\u200B|\u200C|\u200D|\uFEFF/g,
+
+  // Unicode variations
+  /[\u0300-\u036F]/g, // Combining diacritical marks
+
+  // Invisible characters
+  /[\u200E\u200F\u202A-\u202E]/g, // Right-to-left marks
+
+  // Mathematical symbols
+  /[∑∏∆∇∫]/g
+];
+
+// Any character from the patterns above; clean text is ruled out in one scan
+const ADVANCED_OBFUSCATION_CHARS = /[\u200B-\u200D\uFEFF\u0300-\u036F\u200E\u200F\u202A-\u202E∑∏∆∇∫]/;
+
+// Techniques whose patterns list whole-word variants rather than character swaps
+const WHOLE_WORD_TECHNIQUES = new Set(['spacing', 'case_variation', 'fragmentation']);
+
+// Case folding of a UTF-16 code unit as a non-unicode /i regex does it (upper case,
+// unless that takes a non-ASCII character into ASCII), filled in lazily
+const canonicalCodes = new Int32Array(65536).fill(-1);
+
+function canonicalCode(code) {
+  let canonical = canonicalCodes[code];
+  if (canonical < 0) {
+    const upper = String.fromCharCode(code).toUpperCase();
+    canonical = upper.length === 1 && !(code >= 128 && upper.charCodeAt(0) < 128) ? upper.charCodeAt(0) : code;
+    canonicalCodes[code] = canonical;
+  }
+  return canonical;
+}
+
+// Aho-Corasick automaton over the case-folded forms: node 0 is the root, and
+// outputs[node] lists every form index ending there (including through fail links)
+function buildFormAutomaton(forms) {
+  const children = [new Map()];
+  const fail = [0];
+  const outputs = [[]];
+
+  forms.forEach((form, index) => {
+    let node = 0;
+    for (let i = 0; i < form.length; i++) {
+      const code = canonicalCode(form.charCodeAt(i));
+      let next = children[node].get(code);
+      if (next === undefined) {
+        next = children.length;
+        children.push(new Map());
+        fail.push(0);
+        outputs.push([]);
+        children[node].set(code, next);
+      }
+      node = next;
+    }
+    outputs[node].push(index);
+  });
+
+  // Breadth-first, so a node's fail target is complete before the node itself
+  const queue = Array.from(children[0].values());
+  for (let head = 0; head < queue.length; head++) {
+    const node = queue[head];
+    for (const [code, child] of children[node]) {
+      let state = fail[node];
+      while (state !== 0 && !children[state].has(code)) state = fail[state];
+      const target = children[state].get(code);
+      fail[child] = target !== undefined && target !== child ? target : 0;
+      if (outputs[fail[child]].length > 0) outputs[child] = outputs[child].concat(outputs[fail[child]]);
+      queue.push(child);
+    }
+  }
+
+  return { children, fail, outputs };
+}
+
 class ObfuscationMatch {
   constructor(word, obfuscatedForm, confidence, technique, position) {
     this.word = word;
@@ -16,6 +102,17 @@ class ObfuscationMatch {
 class ObfuscationDetector {
   constructor() {
     this.obfuscationTechniques = this._initializeTechniques();
+    this._compileTechniquePatterns();
+
+    // One automaton over the obfuscated forms of every target word seen so far; it is
+    // rebuilt only when a call brings a new word (starting over past maxAutomatonWords)
+    this.formAutomaton = null;
+    this.maxAutomatonWords = 500;
+
+    // Obfuscated forms (with their confidence) per technique and target word; the
+    // common abusive words arrive on every call, so their forms are built only once
+    this.formsCache = new Map();
+    this.maxFormsCacheSize = 1000;
 
     this.stats = {
       total_scanned: 0,
@@ -100,6 +197,90 @@ class ObfuscationDetector {
     };
   }
 
+  _compileTechniquePatterns() {
+    for (const [technique, config] of Object.entries(this.obfuscationTechniques)) {
+      for (const pattern of config.patterns) {
+        pattern.originalRegex = new RegExp(pattern.original, 'g');
+      }
+
+      // Index every variant once so a target word is checked with one lookup, not a scan per pattern
+      if (WHOLE_WORD_TECHNIQUES.has(technique)) {
+        config.variants = new Set(config.patterns.flatMap(pattern => pattern.obfuscated));
+      }
+    }
+  }
+
+  _getFormAutomaton(targetWords) {
+    let automaton = this.formAutomaton;
+    const missing = automaton
+      ? targetWords.filter(word => !automaton.entriesByWord.has(word.toLowerCase()))
+      : targetWords;
+
+    if (missing.length > 0) {
+      const words = automaton && automaton.entriesByWord.size + missing.length <= this.maxAutomatonWords
+        ? [...automaton.entriesByWord.keys(), ...missing]
+        : targetWords;
+
+      // Every (target word, technique, form), each word's entries in the order the
+      // techniques are tried
+      const entries = [];
+      const entriesByWord = new Map();
+
+      for (const word of words) {
+        const targetLower = word.toLowerCase();
+        if (entriesByWord.has(targetLower)) continue;
+
+        const first = entries.length;
+        for (const [technique, config] of Object.entries(this.obfuscationTechniques)) {
+          for (const { form, confidence } of this._getObfuscatedForms(targetLower, technique, config)) {
+            entries.push({ targetWord: targetLower, technique, form, confidence });
+          }
+        }
+        entriesByWord.set(targetLower, { first, end: entries.length });
+      }
+
+      automaton = buildFormAutomaton(entries.map(entry => entry.form));
+      automaton.entries = entries;
+      automaton.entriesByWord = entriesByWord;
+      this.formAutomaton = automaton;
+    }
+
+    return automaton;
+  }
+
+  /**
+   * Find every form of the automaton in one pass over the text, case-insensitively.
+   * Like matchAll on a single form's regex, occurrences of one form never overlap.
+   * @returns {Array<number[]|undefined>} Start positions per entry, ascending (unset if none)
+   */
+  _scanForms(automaton, text) {
+    const { children, fail, outputs, entries } = automaton;
+    const positions = new Array(entries.length);
+    const nextFree = new Int32Array(entries.length);
+    let node = 0;
+
+    for (let i = 0; i < text.length; i++) {
+      const code = canonicalCode(text.charCodeAt(i));
+      let next = children[node].get(code);
+      while (next === undefined && node !== 0) {
+        node = fail[node];
+        next = children[node].get(code);
+      }
+      node = next === undefined ? 0 : next;
+
+      for (const index of outputs[node]) {
+        const start = i + 1 - entries[index].form.length;
+        if (start >= nextFree[index]) {
+          if (positions[index]) positions[index].push(start);
+          else positions[index] = [start];
+          nextFree[index] = i + 1;
+        }
+      }
+    }
+
+    return positions;
+  }
+
   detectObfuscatedWords(text, targetWords = []) {
     this.stats.total_scanned++;
 
@@ -108,11 +289,13 @@ class ObfuscationDetector {
         return [];
       }
 
+      // Every form of every target word is found in a single scan of the text
       const matches = [];
-      const lowerText = text.toLowerCase();
+      const automaton = this._getFormAutomaton(targetWords);
+      const positions = this._scanForms(automaton, text);
 
       for (const targetWord of targetWords) {
-        const wordMatches = this._detectWordObfuscations(lowerText, targetWord, text);
+        const wordMatches = this._detectWordObfuscations(text, targetWord, automaton, positions);
         matches.push(...wordMatches);
       }
 
@@ -135,14 +318,24 @@ class ObfuscationDetector {
     }
   }
 
-  _detectWordObfuscations(text, targetWord, originalText) {
+  _detectWordObfuscations(text, targetWord, automaton, positions) {
     const matches = [];
-    const targetLower = targetWord.toLowerCase();
-
-    // Try each obfuscation technique
-    for (const [technique, config] of Object.entries(this.obfuscationTechniques)) {
-      const techniqueMatches = this._applyTechnique(text, originalText, targetLower, technique, config);
-      matches.push(...techniqueMatches);
+    const { first, end } = automaton.entriesByWord.get(targetWord.toLowerCase());
+
+    // Entries are ordered by technique, then form, as each technique is tried in turn
+    for (let index = first; index < end; index++) {
+      if (!positions[index]) continue;
+
+      const { targetWord: targetLower, technique, form, confidence } = automaton.entries[index];
+      for (const start of positions[index]) {
+        matches.push(new ObfuscationMatch(
+          targetLower,
+          text.substring(start, start + form.length),
+          confidence,
+          technique,
+          start
+        ));
+      }
     }
 
     // Remove duplicates based on position and keep highest confidence
@@ -151,30 +344,34 @@ class ObfuscationDetector {
     return uniqueMatches;
   }
 
-  _applyTechnique(text, originalText, targetWord, technique, config) {
-    const matches = [];
+  _getObfuscatedForms(targetWord, technique, config) {
+    const key = `${technique}\u0000${targetWord}`;
+    let forms = this.formsCache.get(key);
 
-    for (const pattern of config.patterns) {
-      const obfuscatedForms = this._generateObfuscatedForms(targetWord, pattern, technique);
-
-      for (const obfuscatedForm of obfuscatedForms) {
-        const regex = new RegExp(this._escapeRegex(obfuscatedForm), 'gi');
-        const textMatches = [...originalText.matchAll(regex)];
-
-        for (const match of textMatches) {
-          const confidence = this._calculateConfidence(targetWord, obfuscatedForm, technique);
-          matches.push(new ObfuscationMatch(
-            targetWord,
-            match[0],
-            confidence,
-            technique,
-            match.index
-          ));
+    if (!forms) {
+      forms = [];
+
+      if (!config.variants || config.variants.has(targetWord)) {
+        for (const pattern of config.patterns) {
+          // Character swaps leave the word unchanged (and filtered out) when the character is absent
+          if (!config.variants && !targetWord.includes(pattern.original)) {
+            continue;
+          }
+
+          for (const form of this._generateObfuscatedForms(targetWord, pattern, technique)) {
+            forms.push({ form, confidence: this._calculateConfidence(targetWord, form, technique) });
+          }
         }
       }
+
+      if (this.formsCache.size >= this.maxFormsCacheSize) {
+        // Remove oldest entry (simple FIFO)
+        this.formsCache.delete(this.formsCache.keys().next().value);
+      }
+      this.formsCache.set(key, forms);
     }
 
-    return matches;
+    return forms;
   }
 
   _generateObfuscatedForms(targetWord, pattern, technique) {
@@ -212,7 +409,7 @@ class ObfuscationDetector {
   _applyLeetSpeak(word, pattern) {
     let result = word;
     for (const obfuscated of pattern.obfuscated) {
-      result = result.replace(new RegExp(pattern.original, 'g'), obfuscated);
+      result = result.replace(pattern.originalRegex, obfuscated);
     }
     return result;
   }
@@ -220,7 +417,7 @@ class ObfuscationDetector {
   _applyRepetition(word, pattern) {
     let result = word;
     for (const obfuscated of pattern.obfuscated) {
-      result = result.replace(new RegExp(pattern.original, 'g'), obfuscated);
+      result = result.replace(pattern.originalRegex, obfuscated);
     }
     return result;
   }
@@ -232,7 +429,7 @@ class ObfuscationDetector {
   _applyHomoglyphs(word, pattern) {
     let result = word;
     for (const obfuscated of pattern.obfuscated) {
-      result = result.replace(new RegExp(pattern.original, 'g'), obfuscated);
+      result = result.replace(pattern.originalRegex, obfuscated);
     }
     return result;
   }
@@ -246,17 +443,7 @@ class ObfuscationDetector {
   }
 
   _calculateConfidence(targetWord, obfuscatedForm, technique) {
-    // Base confidence by technique
-    const techniqueWeights = {
-      leet_speak: 0.8,
-      repetition: 0.6,
-      spacing: 0.9,
-      homoglyphs: 0.7,
-      case_variation: 0.5,
-      fragmentation: 0.8
-    };
-
-    let confidence = techniqueWeights[technique] || 0.5;
+    let confidence = TECHNIQUE_WEIGHTS[technique] || 0.5;
 
     // Adjust based on similarity
     const similarity = this._calculateStringSimilarity(targetWord, obfuscatedForm);
@@ -280,10 +467,6 @@ class ObfuscationDetector {
     return intersection.size / union.size;
   }
 
-  _escapeRegex(string) {
-    return string.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
-  }
-
   _deduplicateMatches(matches) {
     const positionMap = new Map();
 
@@ -319,22 +502,10 @@ class ObfuscationDetector {
 
   // Advanced obfuscation detection for common patterns
   detectAdvancedObfuscation(text) {
-    const advancedPatterns = [
-      // Zero-width characters
-      /\u200B|\u200C|\u200D|\uFEFF/g,
-
-      // Unicode variations
-      /[\u0300-\u036F]/g, // Combining diacritical marks
-
-      // Invisible characters
-      /[\u200E\u200F\u202A-\u202E]/g, // Right-to-left marks
-
-      // Mathematical symbols
-      /[∑∏∆∇∫]/g
-    ];
+    if (!ADVANCED_OBFUSCATION_CHARS.test(text)) return [];
 
     const matches = [];
-    for (const pattern of advancedPatterns) {
+    for (const pattern of ADVANCED_OBFUSCATION_PATTERNS) {
       const found = text.match(pattern);
       if (found) {
         matches.push({
@@ -3,6 +3,46 @@
  * Includes comprehensive patterns for various harassment types and contextual analysis
  */
 
+const LINE_TERMINATORS = new Set(['\n', '\r', '\u2028', '\u2029']);
+
+// Case folding used by non-unicode /i regexes when comparing backreferences
+function canonicalizeChar(char) {
+  const upper = char.toUpperCase();
+  if (upper.length !== 1) return char;
+  if (char.charCodeAt(0) >= 128 && upper.charCodeAt(0) < 128) return char;
+  return upper;
+}
+
+/**
+ * Linear-time equivalent of text.match(/(.)\1{minRun-1,}/gi): returns every maximal
+ * run of at least minRun identical (case-insensitive) characters, or null.
+ */
+function findCharacterRuns(text, minRun) {
+  const runs = [];
+  let i = 0;
+
+  while (i < text.length) {
+    const char = text[i];
+    if (LINE_TERMINATORS.has(char)) {
+      i++;
+      continue;
+    }
+
+    const canonical = canonicalizeChar(char);
+    let j = i + 1;
+    while (j < text.length && (text[j] === char || canonicalizeChar(text[j]) === canonical)) {
+      j++;
+    }
+
+    if (j - i >= minRun) {
+      runs.push(text.slice(i, j));
+    }
+    i = j;
+  }
+
+  return runs.length > 0 ? runs : null;
+}
+
 class MessagePattern {
   constructor(patternType, confidence, description, severity, metadata = {}) {
     this.pattern_type = patternType;
@@ -24,6 +64,9 @@ class PatternAnalysis {
 class PatternAnalyzer {
   constructor() {
     this.patterns = this._initializePatterns();
+    for (const config of Object.values(this.patterns)) {
+      config.patterns.forEach(patternConfig => this._classifyPattern(patternConfig));
+    }
 
     this.stats = {
       total_analyzed: 0,
@@ -40,17 +83,17 @@ class PatternAnalyzer {
       // Repetition patterns
       repetition: {
         patterns: [
-          { regex: /(.)\1{3,}/gi, description: "Character repetition (4+)", severity: 2 },
+          { regex: /(.)\1{3,}/gi, matcher: text => findCharacterRuns(text, 4), description: "Character repetition (4+)", severity: 2 },
           { regex: /\b(\w+)\s+\1\b/gi, description: "Word repetition", severity: 1 },
-          { regex: /(!{3,}|\?{3,})/gi, description: "Punctuation repetition", severity: 1 }
+          { regex: /(!{3,}|\?{3,})/gi, requires: 'hasRepeatedPunctuation', description: "Punctuation repetition", severity: 1 }
         ]
       },
 
       // Caps patterns
       caps: {
         patterns: [
-          { regex: /\b[A-Z]{4,}\b/g, description: "All caps words (4+ letters)", severity: 3 },
-          { regex: /[A-Z]{10,}/g, description: "Long caps sequences", severity: 4 },
+          { regex: /\b[A-Z]{4,}\b/g, requires: 'hasUppercase', description: "All caps words (4+ letters)", severity: 3 },
+          { regex: /[A-Z]{10,}/g, requires: 'hasUppercase', description: "Long caps sequences", severity: 4 },
           { regex: /^[A-Z\s!?.]+$/, description: "All caps message", severity: 5 }
         ]
       },
@@ -59,9 +102,9 @@ class PatternAnalyzer {
       spam: {
         patterns: [
           { regex: /(buy now|click here|free money|guaranteed)/gi, description: "Spam keywords", severity: 4 },
-          { regex: /\$\d+.*(?:per|for|daily|hourly)/gi, description: "Money offers", severity: 4 },
-          { regex: /(http|https|www\.)\S+/gi, description: "URLs in message", severity: 2 },
-          { regex: /@\w+/g, description: "Multiple mentions", severity: 1 }
+          { regex: /\$\d+.*(?:per|for|daily|hourly)/gi, requires: 'hasDollar', description: "Money offers", severity: 4 },
+          { regex: /(http|https|www\.)\S+/gi, requires: 'hasUrlPrefix', description: "URLs in message", severity: 2 },
+          { regex: /@\w+/g, requires: 'hasAt', description: "Multiple mentions", severity: 1 }
         ]
       },
 
@@ -170,7 +213,7 @@ class PatternAnalyzer {
           { regex: /\b(invest|investment|crypto|bitcoin)\s+(now|today|opportunity)/gi, description: "Investment scams", severity: 4 },
           { regex: /\b(guaranteed|risk-free|double\s+your\s+money)/gi, description: "Guaranteed returns", severity: 4 },
           { regex: /\b(send\s+money|wire\s+transfer|paypal)\s+(to|for)/gi, description: "Money transfer requests", severity: 5 },
-          { regex: /\b(lottery|prize|winner|won)\s+\$\d+/gi, description: "Fake winnings", severity: 4 }
+          { regex: /\b(lottery|prize|winner|won)\s+\$\d+/gi, requires: 'hasDollar', description: "Fake winnings", severity: 4 }
         ]
       },
 
@@ -235,7 +278,7 @@ class PatternAnalyzer {
     };
   }
 
-  analyzeMessagePatterns(text, context = {}) {
+  analyzeMessagePatterns(text, context = {}, lowerText = null) {
     this.stats.total_analyzed++;
 
     try {
@@ -246,10 +289,11 @@ class PatternAnalyzer {
       const detectedPatterns = [];
       let totalRisk = 0;
       let patternCount = 0;
+      const features = this._scanFeatures(text, lowerText || text.toLowerCase());
 
       // Analyze each pattern category
       for (const [category, config] of Object.entries(this.patterns)) {
-        const categoryPatterns = this._analyzeCategory(text, category, config, context);
+        const categoryPatterns = this._analyzeCategory(text, category, config, context, features);
         detectedPatterns.push(...categoryPatterns);
 
         // Calculate risk contribution
@@ -283,11 +327,27 @@ class PatternAnalyzer {
     }
   }
 
-  _analyzeCategory(text, category, config, context) {
+  // Cheap presence checks, computed once per message, that let patterns which
+  // cannot possibly match be skipped without running the regex engine
+  _scanFeatures(text, lowerText = text.toLowerCase()) {
+    return {
+      hasUppercase: /[A-Z]/.test(text),
+      hasAt: text.includes('@'),
+      hasDollar: text.includes('$'),
+      hasRepeatedPunctuation: text.includes('!!!') || text.includes('???'),
+      hasUrlPrefix: lowerText.includes('http') || lowerText.includes('www.')
+    };
+  }
+
+  _analyzeCategory(text, category, config, context, features = null) {
     const patterns = [];
 
     for (const patternConfig of config.patterns) {
-      const matches = text.match(patternConfig.regex);
+      if (features && patternConfig.requires && !features[patternConfig.requires]) {
+        continue;
+      }
+
+      const matches = patternConfig.matcher ? patternConfig.matcher(text) : text.match(patternConfig.regex);
 
       if (matches) {
         // Calculate confidence based on match frequency and context
@@ -312,6 +372,12 @@ class PatternAnalyzer {
     return patterns;
   }
 
+  // Read the description once, so confidence checks test a flag instead of searching text
+  _classifyPattern(patternConfig) {
+    patternConfig.capsOrRepetition = patternConfig.description.includes('caps') ||
+      patternConfig.description.includes('repetition');
+  }
+
   _calculateConfidence(matches, text, patternConfig, context) {
     if (!matches || matches.length === 0) return 0;
 
@@ -330,7 +396,7 @@ class PatternAnalyzer {
       const platform = context.platform.toLowerCase();
       if (platform === 'gaming' || platform === 'twitch') {
         // More tolerant of caps and repetition in gaming
-        if (patternConfig.description.includes('caps') || patternConfig.description.includes('repetition')) {
+        if (patternConfig.capsOrRepetition) {
           confidence *= 0.7;
         }
       } else if (platform === 'professional' || platform === 'linkedin') {
@@ -504,11 +570,13 @@ class PatternAnalyzer {
         this.patterns[category] = { patterns: [] };
       }
 
-      this.patterns[category].patterns.push({
+      const patternConfig = {
         regex: compiledRegex,
         description: description,
         severity: severity
-      });
+      };
+      this._classifyPattern(patternConfig);
+      this.patterns[category].patterns.push(patternConfig);
 
       console.log(`Added custom pattern to ${category}: ${description}`);
       return true;
@@ -27,6 +27,248 @@ class MessageType {
   static NONE = "none";
 }
 
+// Keyword fallbacks, ranked after every message pattern; earlier types win
+const FALLBACK_MESSAGE_TYPES = [
+  [MessageType.INSULT, ['stupid', 'idiot', 'moron', 'loser']],
+  [MessageType.CRITICISM, ['always', 'never', "can't do"]],
+  [MessageType.DISAGREEMENT, ['wrong', 'incorrect', 'false']],
+  [MessageType.FRUSTRATION, ['hate', 'ridiculous', 'insane']],
+  [MessageType.DISMISSAL, ['whatever', 'who cares', 'so what']]
+];
+
+// Number of capture groups in a regex source
+function countCaptureGroups(source) {
+  return new RegExp(`${source}|`).exec('').length - 1;
+}
+
+// Phrases mined from the lowercased message when reframing it
+// (global flags are safe to share: String#match resets lastIndex)
+const CORE_ISSUE_PATTERNS = [
+  /(?:stupid|dumb|bad|terrible|awful)\s+(.+)/gi,
+  /you\s+(?:can't|cannot|never)\s+(.+)/gi,
+  /this\s+(?:doesn't|won't|isn't)\s+(.+)/gi
+];
+
+const DESIRED_OUTCOME_PATTERNS = [
+  /want\s+(.+)/gi,
+  /need\s+(.+)/gi,
+  /should\s+(.+)/gi,
+  /have\s+to\s+(.+)/gi
+];
+
+// String#match with a global regex returns whole matches, so match[1] above is a second
+// match of the same pattern. Each ends in (.+), which runs to the end of the line, so
+// only a message with a line break can match one twice.
+const LINE_BREAK = /[\n\r\u2028\u2029]/;
+
+// Rephrasing results remembered for repeated messages
+const SUGGESTION_CACHE_SIZE = 4096;
+
+// Whole messages that need no rephrasing
+const BENIGN_PHRASES = new Set(['hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening', 'thanks', 'thank you']);
+
+// Words dropped when pulling the topic out of a message
+const TOPIC_STOPWORDS = new Set(['stupid', 'dumb', 'wrong', 'terrible', 'awful', 'hate', 'you', 'your', 'this', 'that']);
+
+// Negative words (checked in order) and the constructive direction each suggests
+const CRITICISM_SUGGESTIONS = [
+  ['stupid', 'finding a clearer approach'],
+  ['wrong', 'exploring different options'],
+  ['bad', 'improving this'],
+  ['terrible', 'making this better'],
+  ['awful', 'finding a better way'],
+  ['useless', 'making this more effective']
+];
+
+// Harsh words and phrases, each with milder alternatives
+const TONE_SOFTENERS = {
+  'you are': ['you might be', 'you seem to be', 'it appears you are'],
+  'you\'re': ['you might be', 'you seem', 'it appears you\'re'],
+  'obviously': ['it seems that', 'perhaps', 'it appears that'],
+  'clearly': ['it seems', 'perhaps', 'it might be that'],
+  'stupid': ['not well thought out', 'confusing', 'unclear'],
+  'dumb': ['not clear', 'confusing', 'hard to understand'],
+  'idiotic': ['not well planned', 'unclear', 'confusing'],
+  'ridiculous': ['surprising', 'unexpected', 'unusual'],
+  'pathetic': ['disappointing', 'concerning', 'unfortunate'],
+  'terrible': ['not ideal', 'challenging', 'difficult'],
+  'awful': ['not great', 'challenging', 'difficult'],
+  'hate': ['strongly dislike', 'find frustrating', 'have concerns about'],
+  'disgusting': ['concerning', 'troubling', 'problematic'],
+  'never': ['rarely', 'seldom', 'not often'],
+  'always': ['often', 'frequently', 'usually'],
+  'shut up': ['let me share my thoughts', 'I\'d like to add', 'here\'s another perspective'],
+  'you\'re wrong': ['I see it differently', 'I have a different view', 'from my perspective']
+};
+
+// Openers for the empathy strategy
+const EMPATHY_PHRASES = [
+  "I don't appreciate comments that mock or insult others",
+  "Personal insults and body-shaming are never okay",
+  "I believe in treating everyone with respect and dignity",
+  "Let's maintain a respectful conversation",
+  "I prefer to communicate with kindness and respect",
+  "Making fun of others isn't acceptable",
+  "Everyone deserves to be treated with respect",
+  "I'd rather have a respectful dialogue",
+  "Kindness and respect are important to me",
+  "Let's keep our conversation respectful and constructive"
+];
+
+// Openers for constructive reframing
+const CONSTRUCTIVE_STARTERS = [
+  "What if we tried",
+  "Have you considered",
+  "Maybe we could explore",
+  "Another approach might be",
+  "It might help to",
+  "One option could be",
+  "Perhaps we could",
+  "What do you think about",
+  "How about we",
+  "Could we try",
+  "It might be worth",
+  "Let's consider"
+];
+
+// Question templates by kind of message
+const QUESTION_REFRAMERS = {
+  'criticism': [
+    "What do you think about trying {suggestion}?",
+    "How would you feel about {suggestion}?",
+    "What if we approached this by {suggestion}?",
+    "Could we consider {suggestion}?",
+    "Would it help to {suggestion}?"
+  ],
+  'disagreement': [
+    "I'm curious about your thoughts on {topic}",
+    "How do you see {topic}?",
+    "What's your perspective on {topic}?",
+    "Can you help me understand {topic}?",
+    "What am I missing about {topic}?"
+  ],
+  'frustration': [
+    "What would make this situation better?",
+    "How can we improve this?",
+    "What would be most helpful right now?",
+    "What changes would you like to see?",
+    "How can we work together on this?"
+  ]
+};
+
+// Respectful replacements for insults, dismissive and aggressive phrases
+const POSITIVE_ALTERNATIVES = {
+  'insults': {
+    'stupid': ['I prefer respectful discussion', 'let\'s keep things respectful', 'I value treating each other with respect'],
+    'dumb': ['I believe in respectful communication', 'let\'s maintain a respectful dialogue', 'I prefer discussing things respectfully'],
+    'idiot': ['everyone deserves respect', 'let\'s treat each other with respect', 'I value respectful communication'],
+    'moron': ['I prefer kind and respectful dialogue', 'let\'s keep our conversation respectful', 'respect is important to me'],
+    'loser': ['everyone deserves to be treated with dignity', 'let\'s maintain mutual respect', 'I believe in treating others with respect'],
+    'pathetic': ['I prefer positive and respectful discussion', 'let\'s focus on respectful communication', 'respect is essential in our conversations'],
+    'worthless': ['everyone has value and deserves respect', 'let\'s communicate with mutual respect', 'I believe in treating everyone with dignity'],
+    'fatty': [ // <-- IMPROVED SUGGESTIONS
+      "Comments about anyone's body are hurtful and not okay. Let's be respectful.",
+      "That's a hurtful thing to say. I'd appreciate it if you'd stop.",
+      "Personal attacks about appearance aren't acceptable. Let's focus on the conversation kindly."
+    ],
+    'ugly': ['appearance-based insults are hurtful', 'let\'s maintain respectful communication', 'everyone deserves to be treated with dignity']
+  },
+  'dismissive': {
+    'whatever': ['I understand', 'I see', 'okay'],
+    'who cares': ['this might not be important to everyone', 'people may have different priorities'],
+    'so what': ['I see your point', 'I understand'],
+    'big deal': ['this seems important to you']
+  },
+  'aggressive': {
+    'shut up': ['let me share my thoughts', 'I\'d like to add something'],
+    'go away': ['I need some space right now', 'I\'d prefer to talk later'],
+    'leave me alone': ['I need some time to think', 'I\'d like some space'],
+    'mind your own business': ['this is personal for me', 'I\'d rather not discuss this']
+  }
+};
+
+// Openers for the perspective-shift strategy
+const PERSPECTIVE_SHIFTERS = [
+  "From another angle",
+  "Looking at it differently",
+  "Another way to see this",
+  "From a different perspective",
+  "Considering another viewpoint",
+  "If we look at this another way",
+  "From where I stand",
+  "In my experience",
+  "From what I've seen",
+  "Based on my understanding"
+];
+
+// Patterns identifying each message type, in priority order
+const MESSAGE_PATTERNS = {
+  [MessageType.INSULT]: [
+    /\b(stupid|dumb|idiot|moron|loser|pathetic|worthless|fatty|ugly|weird|creepy)\b/gi,
+    /you\s+(are|'re)\s+(so\s+)?(stupid|dumb|pathetic)/gi,
+    /what\s+an?\s+(idiot|moron|loser)/gi,
+    /your\s+(?:mom|mother|dad|father|parent)\s+(?:is|looks?)\s+(.+)/gi,
+    /\b(?:fat|ugly|stupid|dumb)\s+(?:mom|mother|dad|father|parent)\b/gi
+  ],
+  [MessageType.CRITICISM]: [
+    /you\s+(always|never)\s+\w+/gi,
+    /you\s+(can't|cannot)\s+do\s+anything/gi,
+    /you\s+suck\s+at/gi,
+    /you're\s+(terrible|awful|bad)\s+at/gi
+  ],
+  [MessageType.DISAGREEMENT]: [
+    /you're\s+(wrong|mistaken|incorrect)/gi,
+    /that's\s+(not\s+true|false|wrong)/gi,
+    /absolutely\s+not/gi,
+    /no\s+way/gi
+  ],
+  [MessageType.FRUSTRATION]: [
+    /this\s+is\s+(stupid|ridiculous|insane)/gi,
+    /i\s+(hate|can't\s+stand)\s+this/gi,
+    /this\s+makes\s+no\s+sense/gi,
+    /what\s+the\s+(hell|fuck)/gi
+  ],
+  [MessageType.THREAT]: [
+    /i'll\s+\w+\s+you/gi,
+    /you're\s+gonna\s+pay/gi,
+    /watch\s+out/gi,
+    /you'll\s+regret/gi
+  ],
+  [MessageType.DISMISSAL]: [
+    /\b(whatever|who\s+cares|so\s+what|big\s+deal)\b/gi,
+    /don't\s+care/gi,
+    /not\s+my\s+problem/gi
+  ],
+  [MessageType.EXCLUSION]: [
+    /you\s+don't\s+belong/gi,
+    /go\s+back\s+to/gi,
+    /not\s+welcome\s+here/gi,
+    /get\s+out/gi
+  ]
+};
+
+// Educational note shown with the suggestions for each message type
+const EDUCATIONAL_MESSAGES = {
+  [MessageType.INSULT]: "Personal insults and family-related comments can be deeply hurtful. Let's communicate with respect and kindness instead.",
+  [MessageType.CRITICISM]: "Constructive feedback focuses on specific behaviors rather than personal attacks or family members.",
+  [MessageType.DISAGREEMENT]: "It's okay to disagree! Try expressing your different viewpoint respectfully.",
+  [MessageType.FRUSTRATION]: "When frustrated, taking a moment to breathe can help you communicate more clearly.",
+  [MessageType.THREAT]: "Threatening language can be harmful and is never appropriate. Consider expressing your feelings differently.",
+  [MessageType.DISMISSAL]: "Everyone's thoughts and feelings matter. Try to engage more thoughtfully.",
+  [MessageType.EXCLUSION]: "Including others creates a more positive environment for everyone."
+};
+
+// Openers for the collaborative strategy
+const COLLABORATIVE_STARTERS = [
+  "I prefer to communicate with",
+  "I believe in using",
+  "Let's focus on",
+  "I'd appreciate if we could use",
+  "Could we please maintain"
+];
+
+// Suggestions and results are frozen once built: cached results are handed to every
+// caller repeating a message, so none of them may change what the next one sees
 class RephrasingSuggestion {
   constructor(originalText, suggestedText, strategyUsed, explanation, toneImprovement, appropriatenessScore, contextPreserved) {
     this.original_text = originalText;
@@ -36,6 +278,7 @@ class RephrasingSuggestion {
     this.tone_improvement = toneImprovement;
     this.appropriateness_score = appropriatenessScore;
     this.context_preserved = contextPreserved;
+    Object.freeze(this);
   }
 }
 
@@ -43,22 +286,29 @@ class RephrasingResult {
   constructor(originalMessage, messageType, suggestions, educationalNote, confidence) {
     this.original_message = originalMessage;
     this.message_type = messageType;
-    this.suggestions = suggestions;
+    this.suggestions = Object.freeze(suggestions);
     this.educational_note = educationalNote;
     this.confidence = confidence;
+    Object.freeze(this);
   }
 }
 
 class RephrasingEngine {
   constructor() {
-    this.toneSofteners = this._loadToneSofteners();
-    this.empathyPhrases = this._loadEmpathyPhrases();
-    this.constructiveStarters = this._loadConstructiveStarters();
-    this.questionReframers = this._loadQuestionReframers();
-    this.positiveAlternatives = this._loadPositiveAlternatives();
-    this.perspectiveShifters = this._loadPerspectiveShifters();
-    this.messagePatterns = this._loadMessagePatterns();
-    this.educationalMessages = this._loadEducationalMessages();
+    // Lookup tables are module constants, shared by every engine in the process
+    this.toneSofteners = TONE_SOFTENERS;
+    this._compileToneSofteners();
+    this.empathyPhrases = EMPATHY_PHRASES;
+    this.constructiveStarters = CONSTRUCTIVE_STARTERS;
+    this.questionReframers = QUESTION_REFRAMERS;
+    this.positiveAlternatives = POSITIVE_ALTERNATIVES;
+    this.perspectiveShifters = PERSPECTIVE_SHIFTERS;
+    this.messagePatterns = MESSAGE_PATTERNS;
+    this._compileMessageTypeMatchers();
+    this.educationalMessages = EDUCATIONAL_MESSAGES;
+
+    // Results keyed by message (LRU); no strategy reads the context
+    this.suggestionCache = new Map();
 
     this.stats = {
       total_processed: 0,
@@ -70,193 +320,46 @@ class RephrasingEngine {
     console.log('RephrasingEngine initialized');
   }
 
-  _loadToneSofteners() {
-    return {
-      'you are': ['you might be', 'you seem to be', 'it appears you are'],
-      'you\'re': ['you might be', 'you seem', 'it appears you\'re'],
-      'obviously': ['it seems that', 'perhaps', 'it appears that'],
-      'clearly': ['it seems', 'perhaps', 'it might be that'],
-      'stupid': ['not well thought out', 'confusing', 'unclear'],
-      'dumb': ['not clear', 'confusing', 'hard to understand'],
-      'idiotic': ['not well planned', 'unclear', 'confusing'],
-      'ridiculous': ['surprising', 'unexpected', 'unusual'],
-      'pathetic': ['disappointing', 'concerning', 'unfortunate'],
-      'terrible': ['not ideal', 'challenging', 'difficult'],
-      'awful': ['not great', 'challenging', 'difficult'],
-      'hate': ['strongly dislike', 'find frustrating', 'have concerns about'],
-      'disgusting': ['concerning', 'troubling', 'problematic'],
-      'never': ['rarely', 'seldom', 'not often'],
-      'always': ['often', 'frequently', 'usually'],
-      'shut up': ['let me share my thoughts', 'I\'d like to add', 'here\'s another perspective'],
-      'you\'re wrong': ['I see it differently', 'I have a different view', 'from my perspective']
-    };
-  }
-
-  _loadEmpathyPhrases() {
-    return [
-      "I don't appreciate comments that mock or insult others",
-      "Personal insults and body-shaming are never okay",
-      "I believe in treating everyone with respect and dignity",
-      "Let's maintain a respectful conversation",
-      "I prefer to communicate with kindness and respect",
-      "Making fun of others isn't acceptable",
-      "Everyone deserves to be treated with respect",
-      "I'd rather have a respectful dialogue",
-      "Kindness and respect are important to me",
-      "Let's keep our conversation respectful and constructive"
-    ];
-  }
-
-  _loadConstructiveStarters() {
-    return [
-      "What if we tried",
-      "Have you considered",
-      "Maybe we could explore",
-      "Another approach might be",
-      "It might help to",
-      "One option could be",
-      "Perhaps we could",
-      "What do you think about",
-      "How about we",
-      "Could we try",
-      "It might be worth",
-      "Let's consider"
-    ];
-  }
-
-  _loadQuestionReframers() {
-    return {
-      'criticism': [
-        "What do you think about trying {suggestion}?",
-        "How would you feel about {suggestion}?",
-        "What if we approached this by {suggestion}?",
-        "Could we consider {suggestion}?",
-        "Would it help to {suggestion}?"
-      ],
-      'disagreement': [
-        "I'm curious about your thoughts on {topic}",
-        "How do you see {topic}?",
-        "What's your perspective on {topic}?",
-        "Can you help me understand {topic}?",
-        "What am I missing about {topic}?"
-      ],
-      'frustration': [
-        "What would make this situation better?",
-        "How can we improve this?",
-        "What would be most helpful right now?",
-        "What changes would you like to see?",
-        "How can we work together on this?"
-      ]
-    };
-  }
-
-  _loadPositiveAlternatives() {
-    return {
-      'insults': {
-        'stupid': ['I prefer respectful discussion', 'let\'s keep things respectful', 'I value treating each other with respect'],
-        'dumb': ['I believe in respectful communication', 'let\'s maintain a respectful dialogue', 'I prefer discussing things respectfully'],
-        'idiot': ['everyone deserves respect', 'let\'s treat each other with respect', 'I value respectful communication'],
-        'moron': ['I prefer kind and respectful dialogue', 'let\'s keep our conversation respectful', 'respect is important to me'],
-        'loser': ['everyone deserves to be treated with dignity', 'let\'s maintain mutual respect', 'I believe in treating others with respect'],
-        'pathetic': ['I prefer positive and respectful discussion', 'let\'s focus on respectful communication', 'respect is essential in our conversations'],
-        'worthless': ['everyone has value and deserves respect', 'let\'s communicate with mutual respect', 'I believe in treating everyone with dignity'],
-        'fatty': [ // <-- IMPROVED SUGGESTIONS
-          "Comments about anyone's body are hurtful and not okay. Let's be respectful.",
-          "That's a hurtful thing to say. I'd appreciate it if you'd stop.",
-          "Personal attacks about appearance aren't acceptable. Let's focus on the conversation kindly."
-        ],
-        'ugly': ['appearance-based insults are hurtful', 'let\'s maintain respectful communication', 'everyone deserves to be treated with dignity']
-      },
-      'dismissive': {
-        'whatever': ['I understand', 'I see', 'okay'],
-        'who cares': ['this might not be important to everyone', 'people may have different priorities'],
-        'so what': ['I see your point', 'I understand'],
-        'big deal': ['this seems important to you']
-      },
-      'aggressive': {
-        'shut up': ['let me share my thoughts', 'I\'d like to add something'],
-        'go away': ['I need some space right now', 'I\'d prefer to talk later'],
-        'leave me alone': ['I need some time to think', 'I\'d like some space'],
-        'mind your own business': ['this is personal for me', 'I\'d rather not discuss this']
-      }
-    };
+  _compileToneSofteners() {
+    // One whole-word alternation over every harsh word, in table order, so a message is
+    // softened in a single pass; a match lowercases to its key in toneSofteners
+    // (global flags are safe to share: String#replace resets lastIndex)
+    const harshWords = Object.keys(this.toneSofteners).map(harshWord => this._escapeRegex(harshWord));
+    this.toneSoftenerRegex = new RegExp('\\b(?:' + harshWords.join('|') + ')\\b', 'gi');
   }
 
-  _loadPerspectiveShifters() {
-    return [
-      "From another angle",
-      "Looking at it differently",
-      "Another way to see this",
-      "From a different perspective",
-      "Considering another viewpoint",
-      "If we look at this another way",
-      "From where I stand",
-      "In my experience",
-      "From what I've seen",
-      "Based on my understanding"
+  _compileMessageTypeMatchers() {
+    // Every message pattern, then every keyword fallback, as one alternation with a
+    // capture group per type, in priority order (see _identifyMessageType)
+    const entries = [
+      ...Object.entries(this.messagePatterns).map(([msgType, patterns]) =>
+        [msgType, patterns.map(pattern => `(?:${pattern.source})`).join('|')]),
+      ...FALLBACK_MESSAGE_TYPES.map(([msgType, keywords]) =>
+        [msgType, `\\b(?:${keywords.join('|')})\\b`])
     ];
-  }
-
-  _loadMessagePatterns() {
-    return {
-      [MessageType.INSULT]: [
-        /\b(stupid|dumb|idiot|moron|loser|pathetic|worthless|fatty|ugly|weird|creepy)\b/gi,
-        /you\s+(are|'re)\s+(so\s+)?(stupid|dumb|pathetic)/gi,
-        /what\s+an?\s+(idiot|moron|loser)/gi,
-        /your\s+(?:mom|mother|dad|father|parent)\s+(?:is|looks?)\s+(.+)/gi,
-        /\b(?:fat|ugly|stupid|dumb)\s+(?:mom|mother|dad|father|parent)\b/gi
-      ],
-      [MessageType.CRITICISM]: [
-        /you\s+(always|never)\s+\w+/gi,
-        /you\s+(can't|cannot)\s+do\s+anything/gi,
-        /you\s+suck\s+at/gi,
-        /you're\s+(terrible|awful|bad)\s+at/gi
-      ],
-      [MessageType.DISAGREEMENT]: [
-        /you're\s+(wrong|mistaken|incorrect)/gi,
-        /that's\s+(not\s+true|false|wrong)/gi,
-        /absolutely\s+not/gi,
-        /no\s+way/gi
-      ],
-      [MessageType.FRUSTRATION]: [
-        /this\s+is\s+(stupid|ridiculous|insane)/gi,
-        /i\s+(hate|can't\s+stand)\s+this/gi,
-        /this\s+makes\s+no\s+sense/gi,
-        /what\s+the\s+(hell|fuck)/gi
-      ],
-      [MessageType.THREAT]: [
-        /i'll\s+\w+\s+you/gi,
-        /you're\s+gonna\s+pay/gi,
-        /watch\s+out/gi,
-        /you'll\s+regret/gi
-      ],
-      [MessageType.DISMISSAL]: [
-        /\b(whatever|who\s+cares|so\s+what|big\s+deal)\b/gi,
-        /don't\s+care/gi,
-        /not\s+my\s+problem/gi
-      ],
-      [MessageType.EXCLUSION]: [
-        /you\s+don't\s+belong/gi,
-        /go\s+back\s+to/gi,
-        /not\s+welcome\s+here/gi,
-        /get\s+out/gi
-      ]
-    };
-  }
 
-  _loadEducationalMessages() {
-    return {
-      [MessageType.INSULT]: "Personal insults and family-related comments can be deeply hurtful. Let's communicate with respect and kindness instead.",
-      [MessageType.CRITICISM]: "Constructive feedback focuses on specific behaviors rather than personal attacks or family members.",
-      [MessageType.DISAGREEMENT]: "It's okay to disagree! Try expressing your different viewpoint respectfully.",
-      [MessageType.FRUSTRATION]: "When frustrated, taking a moment to breathe can help you communicate more clearly.",
-      [MessageType.THREAT]: "Threatening language can be harmful and is never appropriate. Consider expressing your feelings differently.",
-      [MessageType.DISMISSAL]: "Everyone's thoughts and feelings matter. Try to engage more thoughtfully.",
-      [MessageType.EXCLUSION]: "Including others creates a more positive environment for everyone."
-    };
+    // messageTypeScans[k] holds the k highest-priority types, so once a type has matched
+    // the rest of the message is searched only for types that outrank it
+    const sources = [];
+    this.messageTypeGroups = [];
+    this.messageTypeScans = [null];
+    let group = 1;
+    for (const [msgType, source] of entries) {
+      sources.push(`(${source})`);
+      this.messageTypeGroups.push({ type: msgType, group });
+      this.messageTypeScans.push(new RegExp(sources.join('|'), 'gi'));
+      group += 1 + countCaptureGroups(source);
+    }
   }
 
-  generateSuggestions(message, context = {}) {
+  /**
+   * @param {string} message - Message to rephrase
+   * @param {Object} context - Context information
+   * @param {boolean} flagged - Whether the caller's content detection found the message
+   *   harmful. Only a message it cleared (false) may be answered as fine without suggestions;
+   *   this engine's own patterns are too narrow to judge that alone
+   */
+  generateSuggestions(message, context = {}, flagged = true) {
     this.stats.total_processed++;
 
     try {
@@ -264,9 +367,11 @@ class RephrasingEngine {
         return this._createEmptyResult(message || "");
       }
 
+      // Lowercased once and shared by the classifier and every strategy
+      const messageLower = message.toLowerCase();
+
       // Check for benign messages
-      const benignPhrases = new Set(['hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening', 'thanks', 'thank you']);
-      if (benignPhrases.has(message.toLowerCase().trim())) {
+      if (BENIGN_PHRASES.has(messageLower.trim())) {
         return new RephrasingResult(
           message,
           MessageType.NONE,
@@ -276,14 +381,38 @@ class RephrasingEngine {
         );
       }
 
-      const messageType = this._identifyMessageType(message);
+      // Repeated messages (spam floods, copy-pasted insults) skip every strategy
+      const cachedResult = this.suggestionCache.get(message);
+      if (cachedResult) {
+        // Re-insert so the Map's insertion order tracks recency (LRU)
+        this.suggestionCache.delete(message);
+        this.suggestionCache.set(message, cachedResult);
+        this.stats.successful_rephrasings += cachedResult.suggestions.length > 0 ? 1 : 0;
+        return cachedResult;
+      }
+
+      const messageType = this._identifyMessageType(message, messageLower);
+
+      // Nothing harmful to reframe: detection cleared it, no pattern matched and no harsh
+      // word to soften, so the strategies would only wrap it in generic empathy phrasing
+      if (!flagged && messageType === MessageType.NONE &&
+          messageLower.search(this.toneSoftenerRegex) === -1) {
+        return new RephrasingResult(
+          message,
+          MessageType.NONE,
+          [],
+          "Message appears fine.",
+          1.0
+        );
+      }
+
       const suggestions = [];
 
       // --- MODIFIED STRATEGY LOGIC ---
 
       // **Priority 1: Direct Boundary Setting for Insults**
       if (messageType === MessageType.INSULT) {
-        const boundarySuggestion = this._applyDirectBoundarySetting(message, context);
+        const boundarySuggestion = this._applyDirectBoundarySetting(message, context, messageLower);
         if (boundarySuggestion) {
           suggestions.push(boundarySuggestion);
         }
@@ -294,26 +423,31 @@ class RephrasingEngine {
       if (softened) suggestions.push(softened);
 
       // Strategy 2: Add empathy (can be helpful)
-      const empathetic = this._applyEmpathyAddition(message, context);
+      const empathetic = this._applyEmpathyAddition(message, context, messageLower);
       if (empathetic) suggestions.push(empathetic);
 
       // Strategy 3: Constructive criticism (ONLY for criticism, NOT insults)
       if (messageType === MessageType.CRITICISM) {
-        const constructive = this._applyConstructiveReframing(message, context);
+        const constructive = this._applyConstructiveReframing(message, context, messageLower);
         if (constructive) suggestions.push(constructive);
       }
 
       // Strategy 4: Question reframing (still useful)
-      const questionBased = this._applyQuestionReframing(message, messageType, context);
+      const questionBased = this._applyQuestionReframing(message, messageType, context, messageLower);
       if (questionBased) suggestions.push(questionBased);
 
       // Strategy 5: Perspective shift (can be okay, but lower priority)
-      const perspective = this._applyPerspectiveShifting(message, context);
-      if (perspective) suggestions.push(perspective);
+      // Its 0.7 score is the lowest and it is ranked after the other 0.7 (empathy), so
+      // with five other suggestions certain the top-5 cut below would drop it anyway
+      const collaborativeFollows = messageType !== MessageType.INSULT;
+      if (suggestions.length + (collaborativeFollows ? 1 : 0) < 5) {
+        const perspective = this._applyPerspectiveShifting(message, context);
+        if (perspective) suggestions.push(perspective);
+      }
 
       // Strategy 6: Collaborative approach (AVOID for insults)
-      if (messageType !== MessageType.INSULT) {
-        const collaborative = this._applyCollaborativeApproach(message, context);
+      if (collaborativeFollows) {
+        const collaborative = this._applyCollaborativeApproach(message, context, messageLower);
         if (collaborative) suggestions.push(collaborative);
       }
 
@@ -336,13 +470,16 @@ class RephrasingEngine {
 
       this.stats.successful_rephrasings += finalSuggestions.length > 0 ? 1 : 0;
 
-      return new RephrasingResult(
+      const result = new RephrasingResult(
         message,
         messageType,
         finalSuggestions,
         educationalNote,
         confidence
       );
+      this._cacheSuggestions(message, result);
+
+      return result;
 
     } catch (error) {
       console.error('Error in rephrasing generation:', error);
@@ -351,48 +488,51 @@ class RephrasingEngine {
     }
   }
 
-  _identifyMessageType(message) {
-    const messageLower = message.toLowerCase();
-
-    // Check each message type pattern
-    for (const [msgType, patterns] of Object.entries(this.messagePatterns)) {
-      for (const pattern of patterns) {
-        if (pattern.test(messageLower)) {
-          return msgType;
-        }
-      }
+  _cacheSuggestions(message, result) {
+    if (this.suggestionCache.size >= SUGGESTION_CACHE_SIZE) {
+      // Evict the least recently used entry (first in Map order)
+      this.suggestionCache.delete(this.suggestionCache.keys().next().value);
     }
-
-    // Default categorization based on keywords
-    if (/\b(stupid|idiot|moron|loser)\b/gi.test(messageLower)) {
-      return MessageType.INSULT;
-    } else if (/\b(always|never|can't do)\b/gi.test(messageLower)) {
-      return MessageType.CRITICISM;
-    } else if (/\b(wrong|incorrect|false)\b/gi.test(messageLower)) {
-      return MessageType.DISAGREEMENT;
-    } else if (/\b(hate|ridiculous|insane)\b/gi.test(messageLower)) {
-      return MessageType.FRUSTRATION;
-    } else if (/\b(whatever|who cares|so what)\b/gi.test(messageLower)) {
-      return MessageType.DISMISSAL;
+    this.suggestionCache.set(message, result);
+  }
+
+  _identifyMessageType(message, messageLower = message.toLowerCase()) {
+    // One left-to-right pass for the highest-priority type matching anywhere. After each
+    // match the search narrows to the types outranking it and resumes one character after
+    // where the match started, so an overlapping higher-priority match is still found
+    const groups = this.messageTypeGroups;
+    let bestIndex = groups.length;
+    let position = 0;
+
+    while (bestIndex > 0) {
+      const scan = this.messageTypeScans[bestIndex];
+      scan.lastIndex = position;
+      const match = scan.exec(messageLower);
+      if (match === null) break;
+
+      bestIndex = 0;
+      while (match[groups[bestIndex].group] === undefined) bestIndex++;
+      position = match.index + 1;
     }
 
-    return MessageType.NONE;
+    return bestIndex < groups.length ? groups[bestIndex].type : MessageType.NONE;
   }
 
   _applyToneSoftening(message, context) {
-    let softenedMessage = message;
-    let changesMade = 0;
-
-    // Apply tone softeners
-    for (const [harshWord, softAlternatives] of Object.entries(this.toneSofteners)) {
-      const pattern = new RegExp('\\b' + this._escapeRegex(harshWord) + '\\b', 'gi');
-      if (pattern.test(softenedMessage)) {
-        const replacement = softAlternatives[Math.floor(Math.random() * softAlternatives.length)];
-        softenedMessage = softenedMessage.replace(pattern, replacement);
-        changesMade++;
+    // Every occurrence of a harsh word gets the same alternative, drawn on its first hit
+    const replacements = new Map();
+    const softenedMessage = message.replace(this.toneSoftenerRegex, (match) => {
+      const harshWord = match.toLowerCase();
+      let replacement = replacements.get(harshWord);
+      if (replacement === undefined) {
+        const alternatives = this.toneSofteners[harshWord];
+        replacement = alternatives[Math.floor(Math.random() * alternatives.length)];
+        replacements.set(harshWord, replacement);
       }
-    }
+      return replacement;
+    });
 
+    const changesMade = replacements.size;
     if (changesMade === 0) return null;
 
     return new RephrasingSuggestion(
@@ -406,12 +546,12 @@ class RephrasingEngine {
     );
   }
 
-  _applyEmpathyAddition(message, context) {
+  _applyEmpathyAddition(message, context, messageLower = message.toLowerCase()) {
     const empathyPhrase = this.empathyPhrases[Math.floor(Math.random() * this.empathyPhrases.length)];
 
     let empatheticMessage;
     if (message.trim().endsWith('.') || message.trim().endsWith('!')) {
-      empatheticMessage = `${empathyPhrase}, but ${message.toLowerCase()}`;
+      empatheticMessage = `${empathyPhrase}, but ${messageLower}`;
     } else {
       empatheticMessage = `${empathyPhrase}. ${message}`;
     }
@@ -427,9 +567,9 @@ class RephrasingEngine {
     );
   }
 
-  _applyConstructiveReframing(message, context) {
+  _applyConstructiveReframing(message, context, messageLower = message.toLowerCase()) {
     const starter = this.constructiveStarters[Math.floor(Math.random() * this.constructiveStarters.length)];
-    const coreIssue = this._extractCoreIssue(message);
+    const coreIssue = this._extractCoreIssue(messageLower);
 
     if (!coreIssue) return null;
 
@@ -446,7 +586,7 @@ class RephrasingEngine {
     );
   }
 
-  _applyQuestionReframing(message, messageType, context) {
+  _applyQuestionReframing(message, messageType, context, messageLower = message.toLowerCase()) {
     let questionTemplates = this.questionReframers.criticism;
 
     if (messageType === MessageType.DISAGREEMENT) {
@@ -458,8 +598,8 @@ class RephrasingEngine {
     if (!questionTemplates) return null;
 
     const template = questionTemplates[Math.floor(Math.random() * questionTemplates.length)];
-    const topic = this._extractTopic(message);
-    const suggestion = this._generateSuggestionFromCriticism(message);
+    const topic = this._extractTopic(messageLower);
+    const suggestion = this._generateSuggestionFromCriticism(messageLower);
 
     let questionMessage;
     if (template.includes('{suggestion}') && suggestion) {
@@ -498,17 +638,9 @@ class RephrasingEngine {
     );
   }
 
-  _applyCollaborativeApproach(message, context) {
-    const collaborativeStarters = [
-      "I prefer to communicate with",
-      "I believe in using",
-      "Let's focus on",
-      "I'd appreciate if we could use",
-      "Could we please maintain"
-    ];
-
-    const starter = collaborativeStarters[Math.floor(Math.random() * collaborativeStarters.length)];
-    const goal = this._extractDesiredOutcome(message);
+  _applyCollaborativeApproach(message, context, messageLower = message.toLowerCase()) {
+    const starter = COLLABORATIVE_STARTERS[Math.floor(Math.random() * COLLABORATIVE_STARTERS.length)];
+    const goal = this._extractDesiredOutcome(messageLower);
 
     const collaborativeMessage = goal ? `${starter} ${goal}` : `${starter} find a solution that works for both of us`;
 
@@ -524,8 +656,7 @@ class RephrasingEngine {
   }
 
   // --- NEW BOUNDARY SETTING FUNCTION ---
-  _applyDirectBoundarySetting(message, context) {
-    const messageLower = message.toLowerCase();
+  _applyDirectBoundarySetting(message, context, messageLower = message.toLowerCase()) {
 
     for (const [insult, suggestions] of Object.entries(this.positiveAlternatives.insults)) {
       const pattern = new RegExp('\\b' + this._escapeRegex(insult) + '\\b', 'gi');
@@ -548,15 +679,11 @@ class RephrasingEngine {
   }
   // --- END OF NEW FUNCTION ---
 
-  _extractCoreIssue(message) {
-    const patterns = [
-      /(?:stupid|dumb|bad|terrible|awful)\s+(.+)/gi,
-      /you\s+(?:can't|cannot|never)\s+(.+)/gi,
-      /this\s+(?:doesn't|won't|isn't)\s+(.+)/gi
-    ];
+  _extractCoreIssue(messageLower) {
+    if (!LINE_BREAK.test(messageLower)) return "find a better approach";
 
-    for (const pattern of patterns) {
-      const match = message.toLowerCase().match(pattern);
+    for (const pattern of CORE_ISSUE_PATTERNS) {
+      const match = messageLower.match(pattern);
       if (match && match[1]) {
         return `improve ${match[1].trim()}`;
       }
@@ -565,27 +692,20 @@ class RephrasingEngine {
     return "find a better approach";
   }
 
-  _extractTopic(message) {
-    const words = message.toLowerCase().split(' ');
-    const filteredWords = words.filter(w =>
-      !['stupid', 'dumb', 'wrong', 'terrible', 'awful', 'hate', 'you', 'your', 'this', 'that'].includes(w)
-    );
+  _extractTopic(messageLower) {
+    // Only the first three remaining words are used, so stop collecting there
+    const topicWords = [];
+    for (const word of messageLower.split(' ')) {
+      if (TOPIC_STOPWORDS.has(word)) continue;
+      topicWords.push(word);
+      if (topicWords.length === 3) break;
+    }
 
-    return filteredWords.length >= 2 ? filteredWords.slice(0, 3).join(' ') : "this topic";
+    return topicWords.length >= 2 ? topicWords.join(' ') : "this topic";
   }
 
-  _generateSuggestionFromCriticism(message) {
-    const suggestionsMap = {
-      'stupid': 'finding a clearer approach',
-      'wrong': 'exploring different options',
-      'bad': 'improving this',
-      'terrible': 'making this better',
-      'awful': 'finding a better way',
-      'useless': 'making this more effective'
-    };
-
-    const messageLower = message.toLowerCase();
-    for (const [negativeWord, suggestion] of Object.entries(suggestionsMap)) {
+  _generateSuggestionFromCriticism(messageLower) {
+    for (const [negativeWord, suggestion] of CRITICISM_SUGGESTIONS) {
       if (messageLower.includes(negativeWord)) {
         return suggestion;
       }
@@ -595,28 +715,16 @@ class RephrasingEngine {
   }
 
   _cleanMessageForPerspective(message) {
-    let cleaned = message;
-
-    for (const [harshWord, alternatives] of Object.entries(this.toneSofteners)) {
-      const pattern = new RegExp('\\b' + this._escapeRegex(harshWord) + '\\b', 'gi');
-      if (pattern.test(cleaned)) {
-        cleaned = cleaned.replace(pattern, alternatives[0]);
-      }
-    }
+    const cleaned = message.replace(this.toneSoftenerRegex, match => this.toneSofteners[match.toLowerCase()][0]);
 
     return cleaned.toLowerCase();
   }
 
-  _extractDesiredOutcome(message) {
-    const outcomePatterns = [
-      /want\s+(.+)/gi,
-      /need\s+(.+)/gi,
-      /should\s+(.+)/gi,
-      /have\s+to\s+(.+)/gi
-    ];
+  _extractDesiredOutcome(messageLower) {
+    if (!LINE_BREAK.test(messageLower)) return null;
 
-    for (const pattern of outcomePatterns) {
-      const match = message.toLowerCase().match(pattern);
+    for (const pattern of DESIRED_OUTCOME_PATTERNS) {
+      const match = messageLower.match(pattern);
       if (match && match[1]) {
         return match[1].trim();
       }
@@ -666,15 +774,12 @@ class RephrasingEngine {
     }
   }
 
-  batchGenerateSuggestions(messages, contexts = null) {
-    if (!contexts) {
-      contexts = new Array(messages.length).fill({});
-    }
-
+  // flags[i], when given, is the caller's detection verdict for messages[i] (see generateSuggestions)
+  batchGenerateSuggestions(messages, contexts = null, flags = null) {
     const results = [];
     for (let i = 0; i < messages.length; i++) {
       try {
-        const result = this.generateSuggestions(messages[i], contexts[i]);
+        const result = this.generateSuggestions(messages[i], contexts ? contexts[i] : {}, flags ? flags[i] : true);
         results.push(result);
       } catch (error) {
         console.error(`Error generating suggestions for '${messages[i].substring(0, 50)}...':`, error);
@@ -689,48 +794,33 @@ class RephrasingEngine {
     if (!results || results.length === 0) return {};
 
     const totalResults = results.length;
-    const successfulRephrasings = results.filter(r => r.suggestions && r.suggestions.length > 0).length;
-
-    // Message type distribution
-    const messageTypes = results.map(r => r.message_type);
+    let successfulRephrasings = 0;
+    let confidenceSum = 0;
+    let suggestionCount = 0;
+    let toneImprovementSum = 0;
+    let appropriatenessSum = 0;
     const typeDistribution = {};
-    messageTypes.forEach(type => {
-      typeDistribution[type] = (typeDistribution[type] || 0) + 1;
-    });
+    const strategyDistribution = {};
 
-    // Strategy usage
-    const strategiesUsed = [];
-    results.forEach(result => {
-      if (result.suggestions) {
-        result.suggestions.forEach(suggestion => {
-          strategiesUsed.push(suggestion.strategy_used);
-        });
-      }
-    });
+    // Single pass over results and their suggestions; no intermediate arrays
+    for (const result of results) {
+      typeDistribution[result.message_type] = (typeDistribution[result.message_type] || 0) + 1;
+      confidenceSum += result.confidence;
 
-    const strategyDistribution = {};
-    strategiesUsed.forEach(strategy => {
-      strategyDistribution[strategy] = (strategyDistribution[strategy] || 0) + 1;
-    });
+      if (!result.suggestions) continue;
+      if (result.suggestions.length > 0) successfulRephrasings++;
 
-    // Average scores
-    const avgConfidence = results.reduce((sum, r) => sum + r.confidence, 0) / totalResults;
-
-    const toneImprovements = [];
-    const appropriatenessScores = [];
-    results.forEach(result => {
-      if (result.suggestions) {
-        result.suggestions.forEach(suggestion => {
-          toneImprovements.push(suggestion.tone_improvement);
-          appropriatenessScores.push(suggestion.appropriateness_score);
-        });
+      for (const suggestion of result.suggestions) {
+        strategyDistribution[suggestion.strategy_used] = (strategyDistribution[suggestion.strategy_used] || 0) + 1;
+        toneImprovementSum += suggestion.tone_improvement;
+        appropriatenessSum += suggestion.appropriateness_score;
+        suggestionCount++;
       }
-    });
+    }
 
-    const avgToneImprovement = toneImprovements.length > 0 ?
-      toneImprovements.reduce((sum, t) => sum + t, 0) / toneImprovements.length : 0;
-    const avgAppropriateness = appropriatenessScores.length > 0 ?
-      appropriatenessScores.reduce((sum, a) => sum + a, 0) / appropriatenessScores.length : 0;
+    const avgConfidence = confidenceSum / totalResults;
+    const avgToneImprovement = suggestionCount > 0 ? toneImprovementSum / suggestionCount : 0;
+    const avgAppropriateness = suggestionCount > 0 ? appropriatenessSum / suggestionCount : 0;
 
     return {
       total_processed: totalResults,
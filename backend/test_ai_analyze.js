@@ -8,6 +8,9 @@ const axios = require('axios');
 // Backend URL - change this for production
 const BACKEND_URL = 'http://localhost:5000';
 
+// Most texts /api/ai/predict/batch accepts per request
+const BATCH_SIZE = 100;
+
 // Test data
 const testCases = [
   {
@@ -74,39 +77,43 @@ async function testAnalyzeEndpoint() {
   let passed = 0;
   let failed = 0;
 
-  // Test basic functionality
+  // Test basic functionality: cases go out in batch requests instead of one round trip
+  // each, chunked to the endpoint's limit so the case list can grow past it
   console.log('\n📋 Testing Basic AI Analysis:');
-  for (const testCase of testCases) {
+  for (let offset = 0; offset < testCases.length; offset += BATCH_SIZE) {
+    const batch = testCases.slice(offset, offset + BATCH_SIZE);
     try {
-      console.log(`\nTesting: ${testCase.name}`);
-      console.log(`Content: "${testCase.content}"`);
-
-      const response = await axios.post(`${BACKEND_URL}/api/ai/analyze`, {
-        content: testCase.content,
-        context: { source: 'test', platform: 'web' }
+      const response = await axios.post(`${BACKEND_URL}/api/ai/predict/batch`, {
+        contents: batch.map(testCase => testCase.content),
+        contexts: batch.map(() => ({ source: 'test', platform: 'web' }))
       }, {
         headers: extensionHeaders,
         timeout: 10000
       });
 
-      const result = response.data.data;
-      console.log(`Result: Risk Level: ${result.risk_level}, Is Abusive: ${result.is_abusive}`);
-      console.log(`Score: ${result.risk_score}, Categories: ${result.categories?.join(', ') || 'none'}`);
-
-      // Basic validation
-      if (typeof result.is_abusive === 'boolean' &&
-          typeof result.risk_score === 'number' &&
-          result.risk_level) {
-        console.log('✅ Basic structure validation passed');
-        passed++;
-      } else {
-        console.log('❌ Basic structure validation failed');
-        failed++;
-      }
+      const results = response.data.data.results;
+      batch.forEach((testCase, i) => {
+        const result = results[i];
+        console.log(`\nTesting: ${testCase.name}`);
+        console.log(`Content: "${testCase.content}"`);
+        console.log(`Result: Risk Level: ${result.risk_level}, Is Abusive: ${result.is_abusive}`);
+        console.log(`Score: ${result.risk_score}, Categories: ${result.categories?.join(', ') || 'none'}`);
+
+        // Basic validation
+        if (typeof result.is_abusive === 'boolean' &&
+            typeof result.risk_score === 'number' &&
+            result.risk_level) {
+          console.log('✅ Basic structure validation passed');
+          passed++;
+        } else {
+          console.log('❌ Basic structure validation failed');
+          failed++;
+        }
+      });
 
     } catch (error) {
-      console.log(`❌ Test failed: ${error.message}`);
-      failed++;
+      console.log(`❌ Batch analysis failed: ${error.message}`);
+      failed += batch.length;
     }
   }
 
@@ -140,6 +147,75 @@ async function testAnalyzeEndpoint() {
     }
   }
 
+  // Test that an insult added to a long clean message is caught even right after the clean one
+  console.log('\n📋 Testing Insult Added to a Long Clean Message:');
+  const longCleanContent = 'Thanks everyone for coming to the planning meeting this morning. The notes cover the spring schedule, the garden budget and the volunteer rota. Please read them before Friday and reply with any corrections so we can finalize everything at the next meeting in the library.';
+  const longMessages = [longCleanContent, 'kill yourself ' + longCleanContent, longCleanContent + ' kill yourself'];
+  for (const [i, content] of longMessages.entries()) {
+    try {
+      const response = await axios.post(`${BACKEND_URL}/api/ai/analyze`, {
+        content,
+        context: { source: 'test', platform: 'web' }
+      }, {
+        headers: extensionHeaders,
+        timeout: 10000
+      });
+
+      const result = response.data.data;
+      const expectedAbusive = i > 0;
+      console.log(`\nContent: "${content.slice(0, 40)}..."`);
+      console.log(`Result: Risk Level: ${result.risk_level}, Is Abusive: ${result.is_abusive}`);
+
+      if (result.is_abusive === expectedAbusive) {
+        console.log(`✅ Detected as ${expectedAbusive ? 'abusive' : 'clean'}`);
+        passed++;
+      } else {
+        console.log(`❌ Expected ${expectedAbusive ? 'abusive' : 'clean'}`);
+        failed++;
+      }
+
+    } catch (error) {
+      console.log(`❌ Long message test failed: ${error.message}`);
+      failed++;
+    }
+  }
+
+  // Test that everyday phrases sharing words with multi-word list entries stay clean
+  console.log('\n📋 Testing Everyday Phrases:');
+  const everydayPhrases = [
+    'support for the mentally ill',
+    'he made up a story',
+    'that is fake news honestly',
+    'I want to buy now before the sale ends'
+  ];
+  for (const content of everydayPhrases) {
+    try {
+      const response = await axios.post(`${BACKEND_URL}/api/ai/analyze`, {
+        content,
+        context: { source: 'test', platform: 'web' }
+      }, {
+        headers: extensionHeaders,
+        timeout: 10000
+      });
+
+      const result = response.data.data;
+      console.log(`\nContent: "${content}"`);
+      console.log(`Result: Risk Level: ${result.risk_level}, Is Abusive: ${result.is_abusive}`);
+
+      if (result.is_abusive === false) {
+        console.log('✅ Detected as clean');
+        passed++;
+      } else {
+        console.log('❌ Expected clean');
+        failed++;
+      }
+
+    } catch (error) {
+      console.log(`❌ Everyday phrase test failed: ${error.message}`);
+      failed++;
+    }
+  }
+
   // Test rephrasing suggestions
   console.log('\n📋 Testing Rephrasing Suggestions:');
   try {